@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import generate_restaurant_directory as generator
+from generate_synthetic_data import generate_synthetic_csv
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+# Restaurant pages rendered per size; the page phases report throughput, so a sample is enough
+DEFAULT_PAGE_LIMIT = 10000
+RESULTS_FILE = 'benchmark_results.json'
+
+# Function to record a phase: its time, how many items it handled and the throughput
+def record_phase(phases, name, seconds, items, unit):
+    phases[name] = {
+        'seconds': round(seconds, 4),
+        unit: items,
+        f'{unit}_per_sec': round(items / seconds, 1) if seconds > 0 else None
+    }
+
+# Function to get the peak resident memory of this process in MB
+def peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+# Function to time every build phase on one CSV file, writing pages to output_dir
+def run_phases(csv_file, output_dir, page_limit):
+    phases = {}
+
+    start = time.perf_counter()
+    rows = list(generator.read_csv_rows(csv_file))
+    record_phase(phases, 'csv_ingestion', time.perf_counter() - start, len(rows), 'rows')
+
+    start = time.perf_counter()
+    for row in rows:
+        address = generator.clean_text(row['full_address'])
+        postal_code = generator.clean_text(row['postal_code'])
+        generator.determine_area(address, postal_code)
+        generator.determine_category(generator.clean_text(row['type']), generator.clean_text(row['subtypes']),
+                                     generator.clean_text(row['about']))
+        generator.calculate_score(generator.parse_number(row['rating'], 0.0), int(generator.parse_number(row['reviews'], 0)))
+    record_phase(phases, 'classification', time.perf_counter() - start, len(rows), 'rows')
+    del rows
+
+    start = time.perf_counter()
+    restaurants = list(generator.read_restaurants(csv_file))
+    record_phase(phases, 'restaurant_records', time.perf_counter() - start, len(restaurants), 'rows')
+
+    start = time.perf_counter()
+    data = generator.group_restaurants(restaurants)
+    record_phase(phases, 'grouping_and_sorting', time.perf_counter() - start, len(restaurants), 'rows')
+    del restaurants
+
+    generator.OUTPUT_DIR = output_dir
+    generator.set_build_data(data)
+    generator.create_output_dirs()
+    all_restaurants = data['all_restaurants']
+
+    start = time.perf_counter()
+    for restaurant in all_restaurants:
+        generator.render_restaurant_card(restaurant, 1)
+    record_phase(phases, 'restaurant_cards', time.perf_counter() - start, len(all_restaurants), 'cards')
+
+    # Time the writes inside the page phases separately from the rendering
+    writes = {'seconds': 0.0, 'pages': 0, 'bytes': 0}
+    write_page = generator.write_page
+
+    def timed_write_page(page_path, html):
+        write_start = time.perf_counter()
+        result = write_page(page_path, html)
+        writes['seconds'] += time.perf_counter() - write_start
+        writes['pages'] += 1
+        writes['bytes'] += result[1]
+        return result
+
+    generator.write_page = timed_write_page
+    try:
+        pages = all_restaurants[:page_limit] if page_limit else all_restaurants
+        start = time.perf_counter()
+        for restaurant in pages:
+            generator.generate_restaurant_page(restaurant, data['similar_index'], data['spatial_index'])
+        page_writes = writes['seconds']
+        record_phase(phases, 'restaurant_pages', time.perf_counter() - start - page_writes, len(pages), 'pages')
+
+        start = time.perf_counter()
+        listing_count = writes['pages']
+        for area in generator.AREAS:
+            generator.generate_area_pages(area)
+        for category in generator.CATEGORIES:
+            generator.generate_category_pages(category)
+        listing_count = writes['pages'] - listing_count
+        record_phase(phases, 'listing_pages', time.perf_counter() - start - (writes['seconds'] - page_writes),
+                     listing_count, 'pages')
+    finally:
+        generator.write_page = write_page
+
+    record_phase(phases, 'file_writes', writes['seconds'], writes['pages'], 'pages')
+    phases['file_writes']['bytes'] = writes['bytes']
+    return phases
+
+# Function to benchmark one input size in a fresh process, so its peak memory is its own
+def benchmark_size(rows, data_dir, seed, page_limit):
+    csv_file = os.path.join(data_dir, f'synthetic_{rows}_{seed}.csv')
+    if not os.path.exists(csv_file):
+        print(f"Generating {rows} synthetic rows...", file=sys.stderr)
+        generate_synthetic_csv(csv_file, rows, seed)
+
+    command = [sys.executable, os.path.abspath(__file__), '--run', csv_file, '--page-limit', str(page_limit)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output)
+    result['rows'] = rows
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the build phases of generate_restaurant_directory.py on synthetic data.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='numbers of CSV rows to benchmark (default: %(default)s)')
+    parser.add_argument('--page-limit', type=int, default=DEFAULT_PAGE_LIMIT,
+                        help='restaurant pages rendered per size, 0 for all (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic data (default: %(default)s)')
+    parser.add_argument('--data-dir', default=tempfile.gettempdir(),
+                        help='folder for the synthetic CSV files, which are reused between runs (default: %(default)s)')
+    parser.add_argument('--output', default=RESULTS_FILE, help='JSON file for the results (default: %(default)s)')
+    parser.add_argument('--run', metavar='CSV_FILE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Worker mode: time the phases on one file and print the result as JSON
+    if args.run:
+        output_dir = tempfile.mkdtemp(prefix='restaurant-benchmark-')
+        try:
+            phases = run_phases(args.run, output_dir, args.page_limit)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        print(json.dumps({'phases': phases, 'peak_memory_mb': peak_memory_mb()}))
+        sys.exit(0)
+
+    results = []
+    for rows in args.sizes:
+        result = benchmark_size(rows, args.data_dir, args.seed, args.page_limit)
+        results.append(result)
+        print(f"{rows:>9} rows: " + ', '.join(
+            f"{name} {phase['seconds']:.2f}s" for name, phase in result['phases'].items()
+        ) + f", peak {result['peak_memory_mb']} MB")
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'page_limit': args.page_limit,
+        'seed': args.seed,
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to '{args.output}'")
@@ -1,9 +1,8 @@
 #!/bin/bash
 
-# Create a build directory
-mkdir -p build
+# Mirror zurich_restaurants into build: unchanged files are skipped, new ones are
+# reflinked where the filesystem allows (copied otherwise), and stale ones are deleted.
+# The build manifest is only for incremental builds, so it is not deployed.
+python3 sync_output.py zurich_restaurants build --exclude .build-manifest.json
 
-# Copy all files from zurich_restaurants to build
-cp -r zurich_restaurants/* build/
-
-echo "Build completed. Files copied to build directory." 
\ No newline at end of file
+echo "Build completed. Files synced to build directory."
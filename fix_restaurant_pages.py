@@ -1,62 +1,24 @@
 import os
-import re
-from pathlib import Path
+
+from generate_restaurant_directory import ensure_page_footer
 
 # Directory containing the restaurant HTML files
 restaurant_dir = 'build/restaurant'
 
-# Footer HTML to add to each page
-footer_html = '''
-<footer>
-    <div class="container">
-        <div class="footer-columns">
-            <div class="footer-column">
-                <h3>About Us</h3>
-                <ul class="footer-list">
-                    <li><a href="/">Home</a></li>
-                    <li><a href="/sitemap.html">Sitemap</a></li>
-                </ul>
-            </div>
-            <div class="footer-column">
-                <h3>Explore</h3>
-                <ul class="footer-list">
-                    <li><a href="/italian/">Italian Restaurants</a></li>
-                    <li><a href="/swiss/">Swiss Restaurants</a></li>
-                    <li><a href="/breakfast/">Breakfast Places</a></li>
-                </ul>
-            </div>
-            <div class="footer-column">
-                <h3>Areas</h3>
-                <ul class="footer-list">
-                    <li><a href="/old-town/">Old Town</a></li>
-                    <li><a href="/niederdorf/">Niederdorf</a></li>
-                    <li><a href="/oerlikon/">Oerlikon</a></li>
-                </ul>
-            </div>
-        </div>
-        <div class="footer-sitemap">
-            <a href="/sitemap.html">Sitemap</a>
-        </div>
-    </div>
-</footer>
-'''
-
-# Function to fix restaurant HTML files
+# Function to fix restaurant HTML files with the same transform the generator applies before writing
 def fix_restaurant_page(file_path):
     with open(file_path, 'r', encoding='utf-8') as file:
         content = file.read()
     
-    # Remove any existing style tag at the end
-    content = re.sub(r'<style>.*?</style>\s*</body>', '</body>', content, flags=re.DOTALL)
-    content = re.sub(r'</style>\s*</body>', '</body>', content, flags=re.DOTALL)
-    
-    # Add footer before closing body tag if it doesn't exist
-    if '<footer>' not in content:
-        content = content.replace('</body>', f'{footer_html}\n</body>')
+    # Drop the trailing style block and add the footer; pages that are already fixed are left untouched
+    fixed = ensure_page_footer(content)
+    if fixed == content:
+        return False
     
-    # Write the fixed content back to the file
-    with open(file_path, 'w', encoding='utf-8') as file:
-        file.write(content)
+    # Write the fixed content to a new file, so trees hardlinked by sync_output.py keep their copy
+    with open(file_path + '.tmp', 'w', encoding='utf-8') as file:
+        file.write(fixed)
+    os.replace(file_path + '.tmp', file_path)
     
     return True
 
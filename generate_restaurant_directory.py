@@ -3,8 +3,25 @@ import os
 import re
 import math
 import random
+import heapq
+import functools
 from collections import defaultdict
+from dataclasses import dataclass
 import shutil
+import hashlib
+import json
+import unicodedata
+import gzip
+import time
+import contextlib
+import io
+import datetime
+import importlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Define constants
 CSV_FILE = 'Outscraper-20250307150536s9c_restaurants.csv'
@@ -12,6 +29,48 @@ OUTPUT_DIR = 'zurich_restaurants'
 SITE_NAME = 'Restaurants in Zurich'
 SITE_LOGO = 'logo.png'
 SITE_FAVICON = 'favicon.ico'
+MANIFEST_FILE = '.build-manifest.json'
+# Files that --compress writes .gz/.br siblings for, and the nginx snippet written next to the output folder
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.svg', '.xml', '.js', '.json')
+NGINX_CONFIG_FILE = 'nginx_precompressed.conf'
+# Public address of the site, needed for the absolute URLs in sitemap.xml (set with --site-url)
+SITE_URL = ''
+# Most URLs a single sitemap file may hold; sitemap.xml indexes one sitemap-<n>.xml per batch
+SITEMAP_MAX_URLS = 50000
+# Files written by --profile: cProfile stats, and the same profile as collapsed stacks for flamegraph tools
+PROFILE_FILE = 'build.prof'
+COLLAPSED_STACKS_FILE = 'build.folded'
+# Manifest of content hashes at the end of --archive archives, and the zstd level of .tar.zst ones
+ARCHIVE_MANIFEST = 'SHA256SUMS'
+ZSTD_LEVEL = 10
+# --staged builds go to <output folder>.builds/<build time>, which is named <build time>.staging until it is complete,
+# and the output folder becomes a symlink to the live build. STAGED_BUILDS_KEPT earlier builds are kept for --rollback.
+BUILDS_DIR_SUFFIX = '.builds'
+STAGING_SUFFIX = '.staging'
+STAGED_BUILDS_KEPT = 3
+# Threads writing rendered pages in the background, and how many rendered pages may wait for them
+WRITE_THREADS = 4
+WRITE_QUEUE_SIZE = 256
+# Allocation sites listed per build phase by --memory
+MEMORY_TOP_SITES = 3
+# Folder for the client-side search index and script
+SEARCH_DIR = 'search'
+# How pages link to each other: 'relative' ('../old-town/index.html', works from a plain folder)
+# or 'absolute-clean' ('/old-town/', for hosts serving clean URLs such as Vercel)
+URL_MODE = 'relative'
+
+# How similar restaurants are picked: 'nearby' (closest in the same category) or 'random'
+SIMILAR_RESTAURANTS_MODE = 'nearby'
+SIMILAR_RESTAURANTS_COUNT = 3
+# Seed for the random picks; the same seed and data always give the same pages
+SIMILAR_RESTAURANTS_SEED = 0
+
+# Restaurants per listing page; longer listings continue on /<listing>/page/2/ and so on
+LISTING_PAGE_SIZE = 20
+
+# Grid cell size for the spatial index (0.01 degrees is roughly 1.1 km of latitude)
+GRID_CELL_DEGREES = 0.01
+KM_PER_DEGREE = 111.2
 
 # Define areas in Zurich
 AREAS = [
@@ -25,32 +84,63 @@ CATEGORIES = [
     'Indian', 'Thai', 'Mexican', 'Vegetarian', 'Breakfast'
 ]
 
-# Create output directory structure
-if os.path.exists(OUTPUT_DIR):
-    shutil.rmtree(OUTPUT_DIR)
-os.makedirs(OUTPUT_DIR)
+# Columns read from the Outscraper CSV (the export has over 100, the rest are skipped)
+CSV_COLUMNS = [
+    'name', 'full_address', 'postal_code', 'type', 'subtypes', 'about', 'rating', 'reviews',
+    'site', 'phone', 'photo', 'range', 'latitude', 'longitude', 'street', 'place_id'
+]
 
-# Create directories for each area
-for area in AREAS:
-    area_slug = area.lower().replace(' ', '-')
-    area_dir = os.path.join(OUTPUT_DIR, area_slug)
-    os.makedirs(area_dir)
-    
-    # Create directories for each category within each area
+# A restaurant as used by the page generators, with numeric fields parsed once at load time
+@dataclass(slots=True)
+class Restaurant:
+    name: str
+    address: str
+    postal_code: str
+    type: str
+    category: str
+    area: str
+    rating: float
+    reviews: int
+    score: float
+    website: str
+    phone: str
+    photo: str
+    price_range: str
+    latitude: float | None
+    longitude: float | None
+    street: str = ''
+    place_id: str = ''
+    # Unique URL slug, assigned by assign_slugs() once all restaurants are loaded
+    slug: str = ''
+
+# Function to create the output directory structure (wiping it first for a full rebuild)
+def create_output_dirs(clean=True):
+    # Create output directory structure
+    if clean and os.path.exists(OUTPUT_DIR):
+        shutil.rmtree(OUTPUT_DIR)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # Create directories for each area
+    for area in AREAS:
+        area_slug = area.lower().replace(' ', '-')
+        area_dir = os.path.join(OUTPUT_DIR, area_slug)
+        os.makedirs(area_dir, exist_ok=True)
+        
+        # Create directories for each category within each area
+        for category in CATEGORIES:
+            category_slug = category.lower()
+            category_dir = os.path.join(area_dir, category_slug)
+            os.makedirs(category_dir, exist_ok=True)
+
+    # Create directories for each category at the root level
     for category in CATEGORIES:
         category_slug = category.lower()
-        category_dir = os.path.join(area_dir, category_slug)
-        os.makedirs(category_dir)
+        category_dir = os.path.join(OUTPUT_DIR, category_slug)
+        os.makedirs(category_dir, exist_ok=True)
 
-# Create directories for each category at the root level
-for category in CATEGORIES:
-    category_slug = category.lower()
-    category_dir = os.path.join(OUTPUT_DIR, category_slug)
-    os.makedirs(category_dir)
-
-# Create directory for individual restaurant pages
-restaurant_dir = os.path.join(OUTPUT_DIR, 'restaurant')
-os.makedirs(restaurant_dir)
+    # Create directory for individual restaurant pages
+    restaurant_dir = os.path.join(OUTPUT_DIR, 'restaurant')
+    os.makedirs(restaurant_dir, exist_ok=True)
 
 # Function to clean and normalize text
 def clean_text(text):
@@ -58,6 +148,50 @@ def clean_text(text):
         return ""
     return text.strip()
 
+SLUG_SEPARATORS = re.compile(r'[^a-zA-Z0-9]+')
+SEARCH_WORDS = re.compile(r'[a-z0-9]+')
+
+# Function to create a URL slug from a restaurant name
+def make_slug(name):
+    return SLUG_SEPARATORS.sub('-', name.lower()).strip('-')
+
+# Function to give every restaurant a unique slug, stored on the restaurant so renderers never compute one
+# A name shared by several restaurants gets the street added (burger-king-bahnhofplatz-15), and the
+# place id if that is not enough, so slugs do not depend on CSV order or ranking
+def assign_slugs(restaurants):
+    groups = defaultdict(list)
+    for restaurant in restaurants:
+        base_slug = make_slug(restaurant.name)
+        if not base_slug:
+            # Names written only in symbols or styled letters, e.g. 𝒯𝒶𝒿 𝑀𝒶𝒽𝒶𝓁
+            folded = unicodedata.normalize('NFKD', restaurant.name).encode('ascii', 'ignore').decode('ascii')
+            base_slug = make_slug(folded) or 'restaurant'
+        groups[base_slug].append(restaurant)
+    
+    taken = set()
+    shared = []
+    for base_slug, group in groups.items():
+        if len(group) == 1:
+            group[0].slug = base_slug
+            taken.add(base_slug)
+        else:
+            shared.extend((base_slug, restaurant) for restaurant in group)
+    
+    shared.sort(key=lambda item: (item[0], item[1].street, item[1].place_id))
+    for base_slug, restaurant in shared:
+        street_slug = make_slug(restaurant.street)
+        slug = f"{base_slug}-{street_slug}" if street_slug else base_slug
+        place_slug = make_slug(restaurant.place_id)
+        if slug in taken and place_slug:
+            slug = f"{slug}-{place_slug}"
+        counter = 2
+        unique_slug = slug
+        while unique_slug in taken:
+            unique_slug = f"{slug}-{counter}"
+            counter += 1
+        restaurant.slug = unique_slug
+        taken.add(unique_slug)
+
 # Function to determine area based on address and postal code
 def determine_area(address, postal_code):
     # This is a simplified mapping - in a real scenario, you'd need more precise mapping
@@ -117,69 +251,705 @@ def determine_category(restaurant_type, subtypes, about):
 def calculate_score(rating, reviews):
     if not rating or not reviews:
         return 0
-    try:
-        rating = float(rating)
-        reviews = float(reviews)
-        return rating * math.log(reviews + 1)
-    except:
-        return 0
-
-# Read and process the CSV file
-restaurants_by_area = defaultdict(list)
-restaurants_by_area_category = defaultdict(lambda: defaultdict(list))
+    return rating * math.log(reviews + 1)
 
-with open(CSV_FILE, 'r', encoding='utf-8') as file:
-    reader = csv.DictReader(file)
-    for row in reader:
-        name = clean_text(row.get('name', ''))
-        if not name:
+# Function to parse a numeric column, returning the default when it is missing or invalid
+# float() also accepts 'nan' and 'inf', which would break int() and the coordinate grid
+def parse_number(value, default=None):
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return default
+    return result if math.isfinite(result) else default
+
+# Function to normalize an address for exact-match lookups
+def normalize_address(address):
+    return ' '.join(address.lower().split())
+
+# Function to build the lookup index used for the similar restaurants section
+def build_similar_index(restaurants):
+    by_category = defaultdict(list)
+    by_address = defaultdict(list)
+    for restaurant in restaurants:
+        by_category[restaurant.category].append(restaurant)
+        address_key = normalize_address(restaurant.address)
+        if address_key:
+            by_address[address_key].append(restaurant)
+    return {'by_category': by_category, 'by_address': by_address}
+
+# Function to pick similar restaurants (same category or same address) from the index
+def find_similar_restaurants(restaurant, similar_index, count=3, seed=SIMILAR_RESTAURANTS_SEED):
+    same_category = similar_index['by_category'].get(restaurant.category, [])
+    address_key = normalize_address(restaurant.address)
+    same_address = [r for r in similar_index['by_address'].get(address_key, [])
+                    if r.category != restaurant.category] if address_key else []
+    
+    # Sample positions from both candidate lists instead of shuffling them, with a generator
+    # seeded per restaurant so every build picks the same restaurants for the same data
+    rng = random.Random(f"{seed}:{restaurant.name}:{restaurant.address}")
+    pool_size = len(same_category) + len(same_address)
+    picked = []
+    seen = set()
+    while len(picked) < count and len(seen) < pool_size:
+        position = rng.randrange(pool_size)
+        if position in seen:
             continue
-            
-        address = clean_text(row.get('full_address', ''))
-        postal_code = clean_text(row.get('postal_code', ''))
-        restaurant_type = clean_text(row.get('type', ''))
-        subtypes = clean_text(row.get('subtypes', ''))
-        about = clean_text(row.get('about', ''))
-        rating = row.get('rating', '0')
-        reviews = row.get('reviews', '0')
-        website = clean_text(row.get('site', ''))
-        phone = clean_text(row.get('phone', ''))
-        photo = clean_text(row.get('photo', ''))
-        price_range = clean_text(row.get('range', ''))
+        seen.add(position)
+        if position < len(same_category):
+            candidate = same_category[position]
+        else:
+            candidate = same_address[position - len(same_category)]
+        if candidate.name != restaurant.name:
+            picked.append(candidate)
+    return picked
+
+# Function to map coordinates to a spatial index grid cell
+def grid_cell(latitude, longitude):
+    return (math.floor(latitude / GRID_CELL_DEGREES), math.floor(longitude / GRID_CELL_DEGREES))
+
+# Function to approximate the distance in km between two points (equirectangular)
+def distance_km(lat1, lon1, lat2, lon2):
+    x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = lat2 - lat1
+    return math.hypot(x, y) * KM_PER_DEGREE
+
+# Function to bucket restaurants with coordinates into (category, grid cell) buckets
+def build_spatial_index(restaurants):
+    cells = defaultdict(list)
+    category_cells = defaultdict(list)
+    category_counts = defaultdict(int)
+    for restaurant in restaurants:
+        if restaurant.latitude is None or restaurant.longitude is None:
+            continue
+        row, col = grid_cell(restaurant.latitude, restaurant.longitude)
+        key = (restaurant.category, row, col)
+        if key not in cells:
+            category_cells[restaurant.category].append((row, col))
+        cells[key].append(restaurant)
+        category_counts[restaurant.category] += 1
+    return {'cells': cells, 'category_cells': category_cells, 'category_counts': category_counts}
+
+# Function to find the k closest restaurants in the same category
+def find_nearby_restaurants(restaurant, spatial_index, count=3):
+    latitude, longitude = restaurant.latitude, restaurant.longitude
+    category = restaurant.category
+    total = spatial_index['category_counts'].get(category, 0)
+    if latitude is None or longitude is None or not total:
+        return []
+    
+    cells = spatial_index['cells']
+    occupied_cells = spatial_index['category_cells'][category]
+    center_row, center_col = grid_cell(latitude, longitude)
+    # Anything outside ring r is at least r cells away; scale by the narrower longitude axis
+    ring_km = GRID_CELL_DEGREES * KM_PER_DEGREE * min(1.0, math.cos(math.radians(latitude)))
+    
+    candidates = []
+    examined = 0
+    ring = 0
+    while examined < total:
+        sparse = ring and 8 * ring > len(occupied_cells)
+        if sparse:
+            # Sparse category: visiting the remaining occupied cells is cheaper than walking rings
+            ring_cells = [(row, col) for row, col in occupied_cells
+                          if max(abs(row - center_row), abs(col - center_col)) >= ring]
+        else:
+            ring_cells = [(row, col)
+                          for row in range(center_row - ring, center_row + ring + 1)
+                          for col in range(center_col - ring, center_col + ring + 1)
+                          if max(abs(row - center_row), abs(col - center_col)) == ring]
         
-        # Determine area and category
-        area = determine_area(address, postal_code)
-        category = determine_category(restaurant_type, subtypes, about)
+        for row, col in ring_cells:
+            for candidate in cells.get((category, row, col), ()):
+                examined += 1
+                if candidate is restaurant or candidate.name == restaurant.name:
+                    continue
+                candidates.append((distance_km(latitude, longitude, candidate.latitude, candidate.longitude), candidate))
         
-        # Calculate score for ranking
-        score = calculate_score(rating, reviews)
+        if sparse:
+            break
         
-        # Create restaurant object
-        restaurant = {
-            'name': name,
-            'address': address,
-            'postal_code': postal_code,
-            'type': restaurant_type,
-            'category': category,
-            'rating': rating,
-            'reviews': reviews,
-            'score': score,
-            'website': website,
-            'phone': phone,
-            'photo': photo,
-            'price_range': price_range
-        }
+        # Stop once the k-th closest candidate is nearer than anything in the next ring
+        if len(candidates) >= count:
+            kth_distance = heapq.nsmallest(count, candidates, key=lambda item: item[0])[-1][0]
+            if kth_distance <= ring * ring_km:
+                break
+        ring += 1
+    
+    return [candidate for _, candidate in heapq.nsmallest(count, candidates, key=lambda item: item[0])]
+
+# Function to stream the CSV one row at a time, keeping only the columns in CSV_COLUMNS
+def read_csv_rows(csv_file):
+    with open(csv_file, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        positions = [header.index(column) if column in header else None for column in CSV_COLUMNS]
+        for row in reader:
+            yield {column: row[position] if position is not None and position < len(row) else ''
+                   for column, position in zip(CSV_COLUMNS, positions)}
+
+# Function to turn the CSV rows into Restaurant records
+def read_restaurants(csv_file):
+    for row in read_csv_rows(csv_file):
+        name = clean_text(row['name'])
+        if not name:
+            continue
         
+        address = clean_text(row['full_address'])
+        postal_code = clean_text(row['postal_code'])
+        restaurant_type = clean_text(row['type'])
+        rating = parse_number(row['rating'], 0.0)
+        reviews = int(parse_number(row['reviews'], 0))
+        
+        yield Restaurant(
+            name=name,
+            address=address,
+            postal_code=postal_code,
+            type=restaurant_type,
+            category=determine_category(restaurant_type, clean_text(row['subtypes']), clean_text(row['about'])),
+            area=determine_area(address, postal_code),
+            rating=rating,
+            reviews=reviews,
+            score=calculate_score(rating, reviews),
+            website=clean_text(row['site']),
+            phone=clean_text(row['phone']),
+            photo=clean_text(row['photo']),
+            price_range=clean_text(row['range']),
+            latitude=parse_number(row['latitude']),
+            longitude=parse_number(row['longitude']),
+            street=clean_text(row['street']),
+            place_id=clean_text(row['place_id'])
+        )
+
+# Function to read and process the CSV file
+def load_restaurants(csv_file):
+    return group_restaurants(read_restaurants(csv_file))
+
+# Function to group restaurants by area and category, sorted by score, and build the lookup indexes
+def group_restaurants(restaurants):
+    restaurants_by_area = defaultdict(list)
+    restaurants_by_area_category = defaultdict(dict)
+
+    for restaurant in restaurants:
         # Add to appropriate collections
-        restaurants_by_area[area].append(restaurant)
-        restaurants_by_area_category[area][category].append(restaurant)
+        restaurants_by_area[restaurant.area].append(restaurant)
+        restaurants_by_area_category[restaurant.area].setdefault(restaurant.category, []).append(restaurant)
+
+    # Sort restaurants by score in descending order
+    for area in restaurants_by_area:
+        restaurants_by_area[area].sort(key=lambda x: x.score, reverse=True)
+        
+        for category in restaurants_by_area_category[area]:
+            restaurants_by_area_category[area][category].sort(key=lambda x: x.score, reverse=True)
+
+    # Build the similar and nearby restaurant indexes once so page generation stays linear
+    indexed_restaurants = [restaurant for area in restaurants_by_area for restaurant in restaurants_by_area[area]]
+    assign_slugs(indexed_restaurants)
+    similar_index = build_similar_index(indexed_restaurants)
+    spatial_index = build_spatial_index(indexed_restaurants)
+    
+    return {
+        'restaurants_by_area': restaurants_by_area,
+        'restaurants_by_area_category': restaurants_by_area_category,
+        'all_restaurants': indexed_restaurants,
+        'similar_index': similar_index,
+        'spatial_index': spatial_index
+    }
+
+# Shared build data, set once in the main process and once per worker process
+restaurants_by_area = defaultdict(list)
+restaurants_by_area_category = defaultdict(dict)
+all_restaurants = []
+similar_index = {}
+spatial_index = {}
+previous_pages = {}
+similar_seed = SIMILAR_RESTAURANTS_SEED
+url_mode = URL_MODE
+minify_pages = False
+listing_page_size = LISTING_PAGE_SIZE
+# Pages of an in-memory build by path; while it is a dict, nothing is written to OUTPUT_DIR
+page_store = None
+# Archive of an archive build (see build_archive); while it is set, nothing is written to OUTPUT_DIR either
+output_archive = None
+# Content hashes of the files of an in-memory or archive build, by path
+output_hashes = {}
+# Whether output files are written to a temp file and renamed into place
+atomic_writes = False
+# Background writer state while pages are written by threads (see start_page_writer)
+page_writer = None
+
+# Function to make the loaded data available to the page generators
+def set_build_data(data):
+    global OUTPUT_DIR, restaurants_by_area, restaurants_by_area_category, all_restaurants, similar_index, spatial_index, previous_pages, similar_seed, url_mode, minify_pages, listing_page_size, atomic_writes
+    OUTPUT_DIR = data.get('output_dir', OUTPUT_DIR)
+    restaurants_by_area = data['restaurants_by_area']
+    restaurants_by_area_category = data['restaurants_by_area_category']
+    all_restaurants = data['all_restaurants']
+    similar_index = data['similar_index']
+    spatial_index = data['spatial_index']
+    previous_pages = data.get('previous_pages', {})
+    similar_seed = data.get('similar_seed', SIMILAR_RESTAURANTS_SEED)
+    url_mode = data.get('url_mode', URL_MODE)
+    minify_pages = data.get('minify', False)
+    listing_page_size = data.get('page_size', LISTING_PAGE_SIZE)
+    atomic_writes = data.get('atomic_writes', False)
+    generate_footer.cache_clear()
+    card_cache.clear()
+
+# Function to get the data the page generators currently use, in the form set_build_data takes
+def get_build_data():
+    return {
+        'output_dir': OUTPUT_DIR,
+        'restaurants_by_area': restaurants_by_area,
+        'restaurants_by_area_category': restaurants_by_area_category,
+        'all_restaurants': all_restaurants,
+        'similar_index': similar_index,
+        'spatial_index': spatial_index,
+        'previous_pages': previous_pages,
+        'similar_seed': similar_seed,
+        'url_mode': url_mode,
+        'minify': minify_pages,
+        'page_size': listing_page_size,
+        'atomic_writes': atomic_writes
+    }
+
+# Function to build the link to a site path such as 'old-town/index.html' from a page `level` folders deep
+def site_url(path, level=0):
+    if url_mode == 'absolute-clean':
+        if path == 'index.html' or path.endswith('/index.html'):
+            return '/' + path[:-len('index.html')]
+        if path.endswith('.html'):
+            return '/' + path[:-len('.html')]
+        return '/' + path
+    return '../' * level + path
+
+# Function to compute the template version from this script and the options that change every page,
+# so any template or option change re-renders every page
+def get_template_version(*options):
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read() + repr(options).encode('utf-8')).hexdigest()[:16]
+
+# Function to load the manifest of the previous build, or None if there is no usable one
+def load_manifest():
+    try:
+        with open(os.path.join(OUTPUT_DIR, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('pages'), dict):
+        return None
+    return manifest
+
+# Function to save the page input hashes for the next incremental build, and the [content hash, lastmod] of each page
+# The URL mode is kept too, so prepare_for_vercel.py can tell whether the links suit a clean-URL host
+def save_manifest(template_version, pages, lastmod, url_mode):
+    manifest = json.dumps({'template_version': template_version, 'pages': pages, 'lastmod': lastmod, 'url_mode': url_mode},
+                          indent=0, sort_keys=True)
+    write_output_file(os.path.join(OUTPUT_DIR, MANIFEST_FILE), manifest.encode('utf-8'))
+
+# Function to hash everything a page is rendered from
+def hash_page_inputs(*inputs):
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# Function to check whether a page from the previous build can be kept as it is
+def page_is_current(page_path, inputs_hash):
+    return writes_to_disk() and previous_pages.get(page_path) == inputs_hash and os.path.exists(os.path.join(OUTPUT_DIR, page_path))
+
+# CSS for the call-to-action buttons and centered images of hand-edited restaurant pages
+action_buttons_css = '''
+<style>
+    .restaurant-actions {
+        display: flex;
+        gap: 15px;
+        margin: 25px 0;
+    }
+    
+    .cta-button {
+        display: inline-block;
+        padding: 12px 25px;
+        border-radius: 5px;
+        text-decoration: none;
+        font-weight: 600;
+        text-align: center;
+        transition: all 0.3s ease;
+    }
+    
+    .cta-button:first-child {
+        background-color: #e74c3c;
+        color: white;
+    }
+    
+    .cta-button:first-child:hover {
+        background-color: #c0392b;
+    }
+    
+    .phone-button {
+        background-color: #27ae60;
+        color: white;
+    }
+    
+    .phone-button:hover {
+        background-color: #1f7a2a;
+    }
 
-# Sort restaurants by score in descending order
-for area in restaurants_by_area:
-    restaurants_by_area[area].sort(key=lambda x: float(x['score']), reverse=True)
+    .restaurant-image-container {
+        width: 100%;
+        height: 400px;
+        overflow: hidden;
+        margin: 0 auto 30px;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        display: flex;
+        justify-content: center;
+        align-items: center;
+    }
     
-    for category in restaurants_by_area_category[area]:
-        restaurants_by_area_category[area][category].sort(key=lambda x: float(x['score']), reverse=True)
+    .restaurant-main-image {
+        max-width: 100%;
+        max-height: 100%;
+        object-fit: contain;
+    }
+</style>
+'''
+
+# Footer added to restaurant pages that were saved without one
+fallback_footer_html = '''
+<footer>
+    <div class="container">
+        <div class="footer-columns">
+            <div class="footer-column">
+                <h3>About Us</h3>
+                <ul class="footer-list">
+                    <li><a href="/">Home</a></li>
+                    <li><a href="/sitemap.html">Sitemap</a></li>
+                </ul>
+            </div>
+            <div class="footer-column">
+                <h3>Explore</h3>
+                <ul class="footer-list">
+                    <li><a href="/italian/">Italian Restaurants</a></li>
+                    <li><a href="/swiss/">Swiss Restaurants</a></li>
+                    <li><a href="/breakfast/">Breakfast Places</a></li>
+                </ul>
+            </div>
+            <div class="footer-column">
+                <h3>Areas</h3>
+                <ul class="footer-list">
+                    <li><a href="/old-town/">Old Town</a></li>
+                    <li><a href="/niederdorf/">Niederdorf</a></li>
+                    <li><a href="/oerlikon/">Oerlikon</a></li>
+                </ul>
+            </div>
+        </div>
+        <div class="footer-sitemap">
+            <a href="/sitemap.html">Sitemap</a>
+        </div>
+    </div>
+</footer>
+'''
+
+TEL_BUTTON_WITHOUT_PHONE_CLASS = re.compile(r'<a href="tel:([^"]+)" class="cta-button"([^>]*)>')
+
+# Transforms run over every HTML page before it is written, as (path prefix, function) pairs.
+# Each transform must be idempotent, so running it on its own output changes nothing.
+html_transforms = []
+
+# Function to register an HTML transform for the pages whose path starts with path_prefix
+def html_transform(path_prefix=''):
+    def register(transform):
+        html_transforms.append((path_prefix, transform))
+        return transform
+    return register
+
+# Function to run the registered transforms over a rendered page
+def apply_html_transforms(page_path, html):
+    page_path = page_path.replace(os.sep, '/')
+    for path_prefix, transform in html_transforms:
+        if page_path.startswith(path_prefix):
+            html = transform(html)
+    return html
+
+# Function to give pages with call-to-action buttons their CSS (exactly once) and the phone button class
+@html_transform('restaurant/')
+def style_action_buttons(html):
+    if '<div class="restaurant-actions">' not in html or '</head>' not in html:
+        return html
+    html = html.replace(f'{action_buttons_css}\n', '')
+    html = html.replace('</head>', f'{action_buttons_css}\n</head>', 1)
+    return TEL_BUTTON_WITHOUT_PHONE_CLASS.sub(r'<a href="tel:\1" class="cta-button phone-button"\2>', html)
+
+# A style block (with or without attributes) at the very end of a piece of HTML
+TRAILING_STYLE_BLOCK = re.compile(r'<style\b[^>]*>(?:(?!</?style\b).)*</style>$', re.DOTALL | re.IGNORECASE)
+
+# Function to drop a stray style block right before </body> and add a footer to pages without one
+@html_transform('restaurant/')
+def ensure_page_footer(html):
+    body_end = html.rfind('</body>')
+    if body_end == -1:
+        return html
+    before_body = html[:body_end].rstrip()
+    if before_body.endswith('</style>'):
+        # Only the style block the body ends with, never one further up such as the one in <head>
+        trailing_style = TRAILING_STYLE_BLOCK.search(before_body)
+        style_start = trailing_style.start() if trailing_style else len(before_body) - len('</style>')
+        html = html[:style_start] + html[body_end:]
+    if '<footer>' not in html:
+        html = html.replace('</body>', f'{fallback_footer_html}\n</body>')
+    return html
+
+HTML_KEPT_BLOCKS = re.compile(r'(<(pre|script|textarea)\b.*?</\2\s*>)|(<style\b[^>]*>)(.*?)(</style\s*>)|<!--(?!\[if).*?-->',
+                              re.DOTALL | re.IGNORECASE)
+HTML_WHITESPACE = re.compile(r'\s+')
+# Whitespace next to these tags never renders, so it is dropped; elsewhere it collapses to one space
+HTML_SPACE_AROUND_BLOCK_TAGS = re.compile(
+    r' ?(<(?:!DOCTYPE|/?(?:html|head|body|meta|link|title|style|header|footer|nav|main|section|article|div|ul|ol|li|h[1-6]|p|br))\b[^>]*>) ?',
+    re.IGNORECASE)
+
+# Function to collapse the whitespace of a piece of HTML markup
+def collapse_html_whitespace(html):
+    return HTML_SPACE_AROUND_BLOCK_TAGS.sub(r'\1', HTML_WHITESPACE.sub(' ', html))
+
+# Function to minify a page (with --minify): drops comments and indentation, minifies inline CSS
+# and leaves the contents of <pre>, <script> and <textarea> exactly as they are
+@html_transform()
+def minify_html(html):
+    if not minify_pages:
+        return html
+    parts = []
+    # Markup on both sides of a dropped comment is collapsed as one, so no double space is left behind
+    text = []
+    position = 0
+    for match in HTML_KEPT_BLOCKS.finditer(html):
+        text.append(html[position:match.start()])
+        position = match.end()
+        if not (match.group(1) or match.group(3)):
+            continue
+        parts.append(collapse_html_whitespace(''.join(text)))
+        text = []
+        if match.group(1):
+            parts.append(match.group(1))
+        else:
+            parts.append(match.group(3) + minify_css(match.group(4)) + match.group(5))
+    text.append(html[position:])
+    parts.append(collapse_html_whitespace(''.join(text)))
+    return ''.join(parts)
+
+# Function to get the kind of archive a file name asks for: zip, tar, tar.gz or tar.zst
+def archive_kind(archive_path):
+    name = archive_path.lower()
+    for suffixes, kind in ((('.zip',), 'zip'), (('.tar',), 'tar'), (('.tar.gz', '.tgz'), 'tar.gz'), (('.tar.zst', '.tzst'), 'tar.zst')):
+        if name.endswith(suffixes):
+            return kind
+    raise ValueError(f"Unknown archive type for '{archive_path}': use .zip, .tar, .tar.gz or .tar.zst")
+
+ZSTD_MISSING = "zstd archives need Python 3.14 or the 'zstandard' package"
+
+# Function to check whether a zstd stream can be opened, so a .tar.zst archive fails before the build starts
+def zstd_available():
+    for module in ('compression.zstd', 'zstandard'):
+        try:
+            importlib.import_module(module)
+            return True
+        except ImportError:
+            pass
+    return False
+
+# Function to open a zstd stream, with the zstd module of Python 3.14 or the zstandard package
+def open_zstd(file_path, mode):
+    try:
+        from compression import zstd
+        return zstd.ZstdFile(file_path, mode, level=ZSTD_LEVEL if mode == 'wb' else None)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(ZSTD_MISSING) from None
+    if mode == 'wb':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(file_path, 'wb'))
+    return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'))
+
+# Function to open an archive for streaming files in ('w') or out ('r'); returns the archive and the
+# streams under a tar archive, which have to be closed after it in order
+def open_archive(file_path, kind, mode):
+    import tarfile
+    import zipfile
+    if kind == 'zip':
+        return zipfile.ZipFile(file_path, mode, compression=zipfile.ZIP_DEFLATED), []
+    if kind == 'tar.gz':
+        # No file name or time in the gzip header, so the same build gives the same archive
+        raw = open(file_path, mode + 'b')
+        streams = [gzip.GzipFile(filename='', mode=mode + 'b', fileobj=raw, compresslevel=9, mtime=0), raw]
+    elif kind == 'tar.zst':
+        streams = [open_zstd(file_path, mode + 'b')]
+    else:
+        streams = [open(file_path, mode + 'b')]
+    return tarfile.open(fileobj=streams[0], mode=mode + '|', format=tarfile.PAX_FORMAT), streams
+
+# Function to close an archive and the streams under it
+def close_archive(archive, streams):
+    archive.close()
+    for stream in streams:
+        stream.close()
+
+# Function to add a file of an archive build to the archive, dated the build time
+def add_to_archive(page_path, data):
+    import tarfile
+    import zipfile
+    archive = output_archive['archive']
+    if output_archive['kind'] == 'zip':
+        # Zip dates start in 1980
+        info = zipfile.ZipInfo(page_path, date_time=time.gmtime(max(output_archive['mtime'], 315532800))[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        archive.writestr(info, data)
+    else:
+        info = tarfile.TarInfo(page_path)
+        info.size = len(data)
+        info.mtime = output_archive['mtime']
+        info.mode = 0o644
+        archive.addfile(info, io.BytesIO(data))
+
+# Function to keep a file of an in-memory or archive build, recording its content hash
+def store_output(page_path, data):
+    page_path = page_path.replace(os.sep, '/')
+    output_hashes[page_path] = hashlib.sha256(data).hexdigest()
+    if page_store is not None:
+        page_store[page_path] = data
+    else:
+        add_to_archive(page_path, data)
+
+# Function to check whether the build writes OUTPUT_DIR, rather than memory or an archive
+def writes_to_disk():
+    return page_store is None and output_archive is None
+
+# Function to write an output file, through a temp file renamed into place when atomic_writes is set,
+# so a reader (or a crashed build) never sees a half-written file
+def write_output_file(path, data):
+    if not atomic_writes:
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+    temp_path = path + '.write-tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# Function to start writing pages in background threads, so rendering does not wait on the disk.
+# At most queue_size pages wait to be written; when the queue is full the renderer waits for a free slot.
+def start_page_writer(threads, queue_size):
+    global page_writer
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    page_writer = {
+        'executor': ThreadPoolExecutor(max_workers=threads, thread_name_prefix='page-writer'),
+        'slots': threading.BoundedSemaphore(max(1, queue_size)),
+        'lock': threading.Lock(),
+        'errors': [],
+        'threads': threads, 'files': 0, 'bytes': 0, 'seconds': 0.0, 'waited': 0.0
+    }
+
+# Function to write one queued page on a writer thread
+def run_page_write(writer, path, data):
+    try:
+        start = time.perf_counter()
+        write_output_file(path, data)
+        seconds = time.perf_counter() - start
+        with writer['lock']:
+            writer['files'] += 1
+            writer['bytes'] += len(data)
+            writer['seconds'] += seconds
+    except Exception as error:
+        writer['errors'].append(error)
+    finally:
+        writer['slots'].release()
+
+# Function to queue a page for the writer threads, waiting only while the queue is full
+def queue_page_write(path, data):
+    if page_writer['errors']:
+        raise page_writer['errors'][0]
+    if not page_writer['slots'].acquire(blocking=False):
+        start = time.perf_counter()
+        page_writer['slots'].acquire()
+        page_writer['waited'] += time.perf_counter() - start
+    page_writer['executor'].submit(run_page_write, page_writer, path, data)
+
+# Function to wait for every queued page to be written and stop the writer threads; returns the writer's
+# counters, and raises the first error a writer thread ran into
+def finish_page_writer():
+    global page_writer
+    writer = page_writer
+    if writer is None:
+        return None
+    writer['executor'].shutdown(wait=True)
+    page_writer = None
+    if writer['errors']:
+        raise writer['errors'][0]
+    return writer
+
+# Function to write a rendered page to the output directory (or queue it for the writer threads), returning
+# its size before and after the transforms and the hash of the written content
+def write_page(page_path, html):
+    rendered_size = len(html.encode('utf-8'))
+    data = apply_html_transforms(page_path, html).encode('utf-8')
+    if not writes_to_disk():
+        store_output(page_path, data)
+    elif page_writer is not None:
+        queue_page_write(os.path.join(OUTPUT_DIR, page_path), data)
+    else:
+        write_output_file(os.path.join(OUTPUT_DIR, page_path), data)
+    return rendered_size, len(data), hashlib.sha256(data).hexdigest()
+
+# Function to write a file only when its content changed, so unchanged files keep their mtime
+def write_if_changed(page_path, content):
+    if page_path.endswith('.html'):
+        content = apply_html_transforms(page_path, content)
+    if not writes_to_disk():
+        store_output(page_path, content.encode('utf-8'))
+        return True
+    path = os.path.join(OUTPUT_DIR, page_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    write_output_file(path, content.encode('utf-8'))
+    return True
+
+# Function to create a folder in the output directory (nothing to do for in-memory and archive builds)
+def make_output_dir(folder):
+    if writes_to_disk():
+        os.makedirs(os.path.join(OUTPUT_DIR, folder), exist_ok=True)
+
+# Function to list the files in an output folder, to remove leftovers of earlier builds (none for in-memory
+# and archive builds)
+def list_output_files(folder=''):
+    if not writes_to_disk():
+        return []
+    return os.listdir(os.path.join(OUTPUT_DIR, folder))
+
+# Function to delete pages of the previous build that are no longer generated
+def remove_orphaned_pages(old_pages, new_pages):
+    removed = 0
+    for page_path in old_pages:
+        if page_path in new_pages:
+            continue
+        path = os.path.join(OUTPUT_DIR, page_path)
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+            # Drop folders left empty, such as the page/<n> folders of a listing that got shorter
+            try:
+                os.removedirs(os.path.dirname(path))
+            except OSError:
+                pass
+    return removed
 
 # Create logo SVG
 logo_svg = '''<svg width="300" height="60" xmlns="http://www.w3.org/2000/svg">
@@ -193,9 +963,6 @@ logo_svg = '''<svg width="300" height="60" xmlns="http://www.w3.org/2000/svg">
   <text x="20" y="38" font-family="'Segoe UI', Tahoma, Geneva, Verdana, sans-serif" font-size="22" font-weight="bold" fill="white">Restaurants in Zurich</text>
 </svg>'''
 
-with open(os.path.join(OUTPUT_DIR, SITE_LOGO), 'w') as f:
-    f.write(logo_svg)
-
 # Create CSS file
 css_content = '''
 * {
@@ -379,6 +1146,28 @@ header {
     margin-bottom: 40px;
 }
 
+.pagination {
+    display: flex;
+    justify-content: center;
+    flex-wrap: wrap;
+    gap: 8px;
+    margin-bottom: 40px;
+}
+
+.pagination a, .pagination span {
+    padding: 8px 14px;
+    border-radius: 4px;
+    background-color: #fff;
+    color: #333;
+    text-decoration: none;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+}
+
+.pagination a:hover, .pagination .current {
+    background-color: #d32323;
+    color: white;
+}
+
 .restaurant-card {
     background-color: white;
     border-radius: 8px;
@@ -895,197 +1684,828 @@ footer {
 }
 '''
 
-with open(os.path.join(OUTPUT_DIR, 'style.css'), 'w') as f:
-    f.write(css_content)
+# Restaurant page CSS (merged into the shared stylesheet under body.restaurant-page)
+restaurant_css_content = '''
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+    font-family: 'Montserrat', 'Helvetica Neue', Arial, sans-serif;
+}
 
-# Function to generate HTML for a restaurant card with proper relative paths
-def generate_restaurant_card(restaurant, level=0):
-    # Generate star rating
-    rating_value = float(restaurant['rating']) if restaurant['rating'] else 0
-    full_stars = int(rating_value)
-    half_star = rating_value - full_stars >= 0.5
-    empty_stars = 5 - full_stars - (1 if half_star else 0)
-    
-    stars_html = '★' * full_stars
-    if half_star:
-        stars_html += '½'
-    stars_html += '☆' * empty_stars
-    
-    # Default image if none provided
-    image_url = restaurant['photo'] if restaurant['photo'] else 'https://via.placeholder.com/300x180?text=No+Image'
-    
-    # Price range
-    price_html = restaurant['price_range'] if restaurant['price_range'] else ''
-    
-    # Website button - changed from text link to a button
-    website_html = f'<a href="{restaurant["website"]}" target="_blank">Visit Website</a>' if restaurant["website"] else ''
-    
-    # Create a slug for the restaurant name
-    restaurant_slug = re.sub(r'[^a-zA-Z0-9]', '-', restaurant['name'].lower())
-    restaurant_slug = re.sub(r'-+', '-', restaurant_slug).strip('-')
-    
-    # Create proper relative path based on nesting level
-    base_path = '../' * level
-    
-    # For similar restaurants on individual restaurant pages, we need a special case
-    if level == 2 and 'restaurant' in os.path.dirname(os.path.dirname(os.getcwd())):
-        # If we're in a restaurant page showing similar restaurants
-        link_path = f"../restaurant/{restaurant_slug}.html"
-    else:
-        link_path = f"{base_path}restaurant/{restaurant_slug}.html"
-    
-    return f'''
-    <div class="restaurant-card">
-        <div class="restaurant-image">
-            <img src="{image_url}" alt="{restaurant['name']}">
-        </div>
-        <h3><a href="{link_path}">{restaurant['name']}</a></h3>
-        <div class="restaurant-details">
-            <div class="rating">
-                <span class="stars">{stars_html}</span>
-                <span class="rating-value">{restaurant['rating']}</span>
-                <span class="reviews">({restaurant['reviews']} reviews)</span>
-                <span class="price">{price_html}</span>
-            </div>
-            <div class="type">{restaurant['type']}</div>
-            <div class="address">{restaurant['address']}</div>
-            <div class="contact">
-                {website_html}
-                {f'<span class="phone">{restaurant["phone"]}</span>' if restaurant["phone"] else ''}
-            </div>
-        </div>
-    </div>
-    '''
+body {
+    background-color: #f8f9fa;
+    color: #333;
+    line-height: 1.6;
+}
 
-# Function to generate navigation menu with dropdowns
-def generate_menu(current_area=None, current_category=None, level=0):
-    base_path = '../' * level
-    
-    # Create areas dropdown
-    areas_dropdown = f'''
-    <div class="dropdown">
-        <button class="dropdown-button">Areas ▼</button>
-        <div class="dropdown-content">
-    '''
-    
-    for area in AREAS:
-        area_slug = area.lower().replace(' ', '-')
-        is_current = current_area and current_area.lower() == area.lower()
-        
-        areas_dropdown += f'<a href="{base_path}{area_slug}/index.html"{" class=\"active\"" if is_current else ""}>{area}</a>\n'
-    
-    areas_dropdown += '''
-        </div>
-    </div>
-    '''
-    
-    # Create categories dropdown
-    categories_dropdown = f'''
-    <div class="dropdown">
-        <button class="dropdown-button">Cuisines ▼</button>
-        <div class="dropdown-content">
-    '''
-    
-    for category in CATEGORIES:
-        category_slug = category.lower()
-        categories_dropdown += f'<a href="{base_path}{category_slug}/index.html">{category}</a>\n'
-    
-    categories_dropdown += '''
-        </div>
-    </div>
-    '''
-    
-    return f'''
-    <div class="dropdown-menus">
-        {areas_dropdown}
-        {categories_dropdown}
-    </div>
-    '''
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+}
 
-# Function to generate header with logo and dropdown menus
-def generate_header(level=0):
-    base_path = '../' * level
-    
-    return f'''
-    <header>
-        <div class="logo">
-            <a href="{base_path}index.html">
-                <img src="{base_path}{SITE_LOGO}" alt="{SITE_NAME}">
-            </a>
-        </div>
-        {generate_menu(level=level)}
-    </header>
-    '''
+header {
+    background-color: #fff;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    padding: 15px 0;
+    position: sticky;
+    top: 0;
+    z-index: 100;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
 
-# Function to generate HTML head section with correct CSS path
-def generate_head(title, description, keywords, level=0):
-    base_path = '../' * level
-    
-    return f'''
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <meta name="description" content="{description}">
-        <meta name="keywords" content="{keywords}">
-        <title>{title} - {SITE_NAME}</title>
-        <link rel="stylesheet" href="{base_path}style.css">
-        <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600;700&display=swap" rel="stylesheet">
-        <link rel="icon" type="image/x-icon" href="{base_path}{SITE_FAVICON}">
-    </head>
-    '''
+.logo {
+    display: flex;
+    align-items: center;
+    padding: 0 20px;
+}
 
-# Function to generate footer with three columns of restaurants
-def generate_footer():
-    # Get top breakfast restaurants
-    breakfast_restaurants = []
-    for area in restaurants_by_area:
-        for restaurant in restaurants_by_area[area]:
-            if 'breakfast' in restaurant.get('type', '').lower() or 'breakfast' in restaurant.get('category', '').lower():
-                breakfast_restaurants.append(restaurant)
-    
-    breakfast_restaurants.sort(key=lambda x: float(x['score']), reverse=True)
-    breakfast_restaurants = breakfast_restaurants[:5]
-    
-    # Get top lunch restaurants (using score as proxy)
-    lunch_restaurants = []
-    for area in restaurants_by_area:
-        lunch_restaurants.extend(restaurants_by_area[area])
-    
-    lunch_restaurants.sort(key=lambda x: float(x['score']), reverse=True)
-    lunch_restaurants = lunch_restaurants[6:11]  # Skip the top 6 to get different restaurants
-    
-    # Get top dinner restaurants (using score as proxy, different set)
-    dinner_restaurants = []
-    for area in restaurants_by_area:
-        dinner_restaurants.extend(restaurants_by_area[area])
-    
-    dinner_restaurants.sort(key=lambda x: float(x['score']), reverse=True)
-    dinner_restaurants = dinner_restaurants[12:17]  # Skip more to get different restaurants
-    
-    footer_html = '''
-    <footer>
-        <div class="container">
-            <div class="footer-columns">
-                <div class="footer-column">
-                    <h3>Best Breakfast in Zurich</h3>
-                    <ul class="footer-list">
-    '''
-    
-    # Add breakfast restaurants
-    for restaurant in breakfast_restaurants:
-        footer_html += f'<li><a href="#">{restaurant["name"]}</a></li>\n'
-    
-    footer_html += '''
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h3>Best Lunch in Zurich</h3>
-                    <ul class="footer-list">
-    '''
-    
-    # Add lunch restaurants
-    for restaurant in lunch_restaurants:
-        footer_html += f'<li><a href="#">{restaurant["name"]}</a></li>\n'
+.logo span {
+    font-size: 1.5rem;
+    font-weight: bold;
+    color: #d32323;
+}
+
+.dropdown-menus {
+    display: flex;
+    margin-right: 20px;
+}
+
+.dropdown {
+    position: relative;
+    margin-left: 15px;
+}
+
+.dropdown-button {
+    background-color: #d32323;
+    color: white;
+    padding: 10px 15px;
+    border: none;
+    border-radius: 4px;
+    cursor: pointer;
+    font-weight: bold;
+}
+
+.dropdown-content {
+    display: none;
+    position: absolute;
+    right: 0;
+    background-color: #f9f9f9;
+    min-width: 160px;
+    box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2);
+    z-index: 1;
+    max-height: 400px;
+    overflow-y: auto;
+}
+
+.dropdown-content a {
+    color: black;
+    padding: 12px 16px;
+    text-decoration: none;
+    display: block;
+    text-align: left;
+}
+
+.dropdown-content a:hover {
+    background-color: #f1f1f1;
+}
+
+.dropdown:hover .dropdown-content {
+    display: block;
+}
+
+.dropdown:hover .dropdown-button {
+    background-color: #b01d1d;
+}
+
+.restaurant-header {
+    position: relative;
+    height: 400px;
+    overflow: hidden;
+    margin-bottom: 30px;
+    border-radius: 8px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+
+.restaurant-header img {
+    width: 100%;
+    height: 100%;
+    object-fit: cover;
+}
+
+.restaurant-header-overlay {
+    position: absolute;
+    bottom: 0;
+    left: 0;
+    right: 0;
+    background: linear-gradient(transparent, rgba(0,0,0,0.8));
+    padding: 30px 20px 20px;
+    color: white;
+}
+
+.restaurant-header-overlay h1 {
+    font-size: 2.5rem;
+    margin-bottom: 10px;
+}
+
+.restaurant-meta {
+    display: flex;
+    align-items: center;
+    flex-wrap: wrap;
+    margin-bottom: 10px;
+}
+
+.stars {
+    color: #f8ce0b;
+    margin-right: 5px;
+}
+
+.rating-value {
+    font-weight: bold;
+    margin-right: 5px;
+}
+
+.reviews {
+    color: #ddd;
+    font-size: 0.9rem;
+    margin-right: 15px;
+}
+
+.restaurant-category {
+    background-color: rgba(255,255,255,0.2);
+    padding: 5px 10px;
+    border-radius: 20px;
+    font-size: 0.9rem;
+    margin-right: 10px;
+}
+
+.restaurant-price {
+    color: #2a9d38;
+    font-weight: bold;
+}
+
+.restaurant-content {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 30px;
+    margin-bottom: 40px;
+}
+
+.restaurant-info {
+    flex: 2;
+    min-width: 300px;
+    background-color: white;
+    border-radius: 8px;
+    padding: 30px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+
+.restaurant-info h2 {
+    font-size: 1.5rem;
+    margin-bottom: 15px;
+    color: #333;
+    text-align: left;
+}
+
+.restaurant-info p {
+    margin-bottom: 20px;
+    color: #555;
+}
+
+.restaurant-contact {
+    margin-top: 30px;
+}
+
+.website-btn {
+    display: inline-block;
+    background-color: #d32323;
+    color: white;
+    padding: 10px 20px;
+    border-radius: 4px;
+    text-decoration: none;
+    font-weight: bold;
+    transition: background-color 0.3s;
+}
+
+.website-btn:hover {
+    background-color: #b01d1d;
+}
+
+.phone {
+    display: block;
+    margin-top: 10px;
+    color: #555;
+}
+
+.featured-restaurants {
+    margin: 40px 0;
+}
+
+.featured-restaurants h2 {
+    text-align: center;
+    margin-bottom: 20px;
+}
+
+.restaurant-list {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
+    gap: 20px;
+    margin-bottom: 40px;
+}
+
+.restaurant-card {
+    background-color: white;
+    border-radius: 8px;
+    overflow: hidden;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    transition: transform 0.3s;
+    height: 100%;
+    display: flex;
+    flex-direction: column;
+}
+
+.restaurant-card:hover {
+    transform: translateY(-5px);
+    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+}
+
+.restaurant-image {
+    height: 180px;
+    overflow: hidden;
+}
+
+.restaurant-image img {
+    width: 100%;
+    height: 100%;
+    object-fit: cover;
+    transition: transform 0.3s;
+}
+
+.restaurant-card:hover .restaurant-image img {
+    transform: scale(1.05);
+}
+
+.restaurant-card h3 {
+    padding: 15px;
+    background-color: #f8f9fa;
+    border-bottom: 1px solid #eee;
+}
+
+.restaurant-card h3 a {
+    color: #333;
+    text-decoration: none;
+}
+
+.restaurant-details {
+    padding: 15px;
+    flex-grow: 1;
+    display: flex;
+    flex-direction: column;
+}
+
+.rating {
+    margin-bottom: 10px;
+    display: flex;
+    align-items: center;
+}
+
+.type, .address {
+    margin-bottom: 5px;
+    color: #555;
+}
+
+.contact {
+    margin-top: auto;
+    padding-top: 10px;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.contact a {
+    color: white;
+    text-decoration: none;
+    background-color: #d32323;
+    padding: 8px 15px;
+    border-radius: 4px;
+    font-weight: bold;
+    transition: background-color 0.3s;
+}
+
+.contact a:hover {
+    background-color: #b01d1d;
+}
+
+footer {
+    background-color: #333;
+    color: white;
+    padding: 40px 0;
+    margin-top: 40px;
+}
+
+.footer-columns {
+    display: flex;
+    justify-content: space-between;
+    flex-wrap: wrap;
+}
+
+.footer-column {
+    flex: 1;
+    min-width: 250px;
+    margin-bottom: 20px;
+    padding: 0 15px;
+}
+
+.footer-column h3 {
+    color: #fff;
+    margin-bottom: 20px;
+    font-size: 1.2rem;
+    text-align: center;
+}
+
+.footer-list {
+    list-style: none;
+}
+
+.footer-list li {
+    margin-bottom: 10px;
+}
+
+.footer-list a {
+    color: #ddd;
+    text-decoration: none;
+    transition: color 0.3s;
+}
+
+.footer-list a:hover {
+    color: #d32323;
+    text-decoration: underline;
+}
+
+@media (max-width: 768px) {
+    .restaurant-header {
+        height: 300px;
+    }
+    
+    .restaurant-header-overlay h1 {
+        font-size: 1.8rem;
+    }
+    
+    .restaurant-content {
+        flex-direction: column;
+    }
+    
+    .restaurant-list {
+        grid-template-columns: 1fr;
+    }
+    
+    .dropdown-menus {
+        flex-direction: column;
+    }
+    
+    .dropdown {
+        margin-bottom: 10px;
+    }
+}
+'''
+
+# CSS for the search box in the header of every page (not scoped, the class names are unique)
+search_css_content = '''
+.site-search {
+    position: relative;
+    margin-left: auto;
+    margin-right: 15px;
+}
+
+.site-search input {
+    width: 220px;
+    padding: 9px 12px;
+    border: 1px solid #ddd;
+    border-radius: 4px;
+    font: inherit;
+}
+
+.site-search-results {
+    position: absolute;
+    right: 0;
+    min-width: 280px;
+    margin: 0;
+    padding: 0;
+    list-style: none;
+    background-color: #fff;
+    box-shadow: 0 8px 16px rgba(0,0,0,0.2);
+    z-index: 101;
+}
+
+.site-search-results a {
+    display: block;
+    padding: 10px 14px;
+    color: #333;
+    text-decoration: none;
+}
+
+.site-search-results a:hover {
+    background-color: #f1f1f1;
+}
+
+.site-search-results span {
+    display: block;
+    font-size: 0.85rem;
+    color: #777;
+}
+
+.site-search-results .site-search-message {
+    padding: 10px 14px;
+    color: #777;
+}
+'''
+
+# Script behind the search box: loads the docs table and the shard of each query word on first use,
+# then lists the best ranked restaurants matching every word (by prefix)
+search_js = '''(function () {
+    var box = document.querySelector('.site-search');
+    if (!box) return;
+    var input = box.querySelector('input');
+    var list = box.querySelector('.site-search-results');
+    var cache = {};
+    var latest = 0;
+
+    function load(name) {
+        if (!cache[name]) {
+            cache[name] = fetch(box.dataset.index + name + '.json').then(function (response) {
+                return response.ok ? response.json() : {};
+            }).catch(function (error) {
+                // Let the next query try again instead of keeping the failure
+                delete cache[name];
+                throw error;
+            });
+        }
+        return cache[name];
+    }
+
+    function fold(text) {
+        return text.normalize('NFKD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase();
+    }
+
+    function matches(word) {
+        return load(word[0]).then(function (shard) {
+            var ids = new Set();
+            Object.keys(shard).forEach(function (token) {
+                if (token.startsWith(word)) shard[token].forEach(function (id) { ids.add(id); });
+            });
+            return ids;
+        });
+    }
+
+    input.addEventListener('input', function () {
+        var query = ++latest;
+        var words = fold(input.value).match(/[a-z0-9]+/g) || [];
+        if (!words.length) {
+            list.innerHTML = '';
+            return;
+        }
+        Promise.all([load('docs')].concat(words.map(matches))).then(function (results) {
+            if (query !== latest) return;
+            var index = results[0];
+            var sets = results.slice(1);
+            var ids = Array.from(sets[0]).filter(function (id) {
+                return sets.every(function (set) { return set.has(id); });
+            }).sort(function (a, b) { return a - b; });
+            list.innerHTML = '';
+            ids.slice(0, 10).forEach(function (id) {
+                var doc = index.docs[id];
+                var slug = doc[0] || doc[1].toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '');
+                var item = document.createElement('li');
+                var link = document.createElement('a');
+                var meta = document.createElement('span');
+                link.href = box.dataset.restaurantUrl.replace('{slug}', slug);
+                link.textContent = doc[1];
+                meta.textContent = index.types[doc[2]] + ' \\u00b7 ' + index.areas[doc[3]];
+                link.appendChild(meta);
+                item.appendChild(link);
+                list.appendChild(item);
+            });
+        }).catch(function () {
+            // Offline, or opened from disk (file://) where the index can't be fetched
+            if (query !== latest) return;
+            list.innerHTML = '';
+            var item = document.createElement('li');
+            item.className = 'site-search-message';
+            item.textContent = 'Search unavailable';
+            list.appendChild(item);
+        });
+    });
+})();
+'''
+
+# Function to minify CSS (comments, whitespace and the last semicolon in each block)
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r'([{;])([-a-zA-Z]+)\s*:\s*', r'\1\2:', css)
+    return css.replace(';}', '}').strip()
+
+# Function to prefix a comma separated selector list with a scope selector
+def scope_selectors(selectors, scope):
+    scoped = []
+    for selector in selectors.split(','):
+        if selector == '*':
+            scoped += [scope, f'{scope} *']
+        elif selector == 'body':
+            scoped.append(scope)
+        else:
+            scoped.append(f'{scope} {selector}')
+    return ','.join(scoped)
+
+# Function to scope every rule of minified CSS, including rules inside @media blocks
+def scope_css(css, scope):
+    scoped = []
+    position = 0
+    while position < len(css):
+        brace = css.index('{', position)
+        prelude = css[position:brace]
+        if prelude.startswith('@'):
+            depth = 1
+            end = brace + 1
+            while depth:
+                depth += {'{': 1, '}': -1}.get(css[end], 0)
+                end += 1
+            scoped.append(prelude + '{' + scope_css(css[brace + 1:end - 1], scope) + '}')
+            position = end
+        else:
+            end = css.index('}', brace) + 1
+            scoped.append(scope_selectors(prelude, scope) + css[brace:end])
+            position = end
+    return ''.join(scoped)
+
+# Function to build the shared stylesheet, named by its content hash so it can be cached forever
+# Restaurant pages and the other pages have conflicting rules, so each set is scoped to its pages
+def build_stylesheet():
+    css = (scope_css(minify_css(css_content), 'body:not(.restaurant-page)') +
+           scope_css(minify_css(restaurant_css_content), 'body.restaurant-page') +
+           minify_css(search_css_content))
+    css_hash = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+    return f'style.{css_hash}.css', css
+
+STYLESHEET_FILE, stylesheet_css = build_stylesheet()
+
+# Function to write the logo and stylesheet, removing stylesheets of earlier builds
+def write_static_files():
+    write_if_changed(SITE_LOGO, logo_svg)
+    write_if_changed(STYLESHEET_FILE, stylesheet_css)
+    for file_name in list_output_files():
+        if re.fullmatch(r'style(\.[0-9a-f]+)?\.css', file_name) and file_name != STYLESHEET_FILE:
+            os.remove(os.path.join(OUTPUT_DIR, file_name))
+
+# Function to fold text for the search index: no accents, lower case
+def fold_search_text(text):
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+
+# Function to get the words a restaurant can be found by (house numbers are left out)
+def search_tokens(restaurant):
+    tokens = set(SEARCH_WORDS.findall(fold_search_text(f'{restaurant.name} {restaurant.type} {restaurant.area}')))
+    tokens.update(token for token in SEARCH_WORDS.findall(fold_search_text(restaurant.street)) if not token.isdigit())
+    return {token for token in tokens if len(token) > 1}
+
+# Function to build the search index files: docs.json with the restaurants in ranking order, and one
+# shard per first character mapping each word to the positions of the restaurants that contain it
+def build_search_index(restaurants):
+    ranked = sorted(restaurants, key=lambda x: (-x.score, x.slug))
+    types = sorted({restaurant.type for restaurant in ranked})
+    areas = sorted({restaurant.area for restaurant in ranked})
+    type_ids = {restaurant_type: position for position, restaurant_type in enumerate(types)}
+    area_ids = {area: position for position, area in enumerate(areas)}
+    
+    docs = []
+    shards = defaultdict(lambda: defaultdict(list))
+    for position, restaurant in enumerate(ranked):
+        # The script derives the slug from an ASCII name the same way make_slug does, so it is left out
+        slug = '' if restaurant.name.isascii() and restaurant.slug == make_slug(restaurant.name) else restaurant.slug
+        docs.append([slug, restaurant.name, type_ids[restaurant.type], area_ids[restaurant.area]])
+        for token in search_tokens(restaurant):
+            shards[token[0]][token].append(position)
+    
+    files = {'docs.json': {'types': types, 'areas': areas, 'docs': docs}}
+    for first_char, postings in sorted(shards.items()):
+        files[f'{first_char}.json'] = dict(sorted(postings.items()))
+    return {file_name: json.dumps(content, separators=(',', ':'), ensure_ascii=False)
+            for file_name, content in files.items()}
+
+# Function to write the search index and script, removing shards that are no longer needed; returns the index size
+def write_search_index(restaurants):
+    files = build_search_index(restaurants)
+    make_output_dir(SEARCH_DIR)
+    for file_name, content in files.items():
+        write_if_changed(os.path.join(SEARCH_DIR, file_name), content)
+    write_if_changed(os.path.join(SEARCH_DIR, 'search.js'), search_js)
+    for file_name in list_output_files(SEARCH_DIR):
+        if file_name.endswith('.json') and file_name not in files:
+            os.remove(os.path.join(OUTPUT_DIR, SEARCH_DIR, file_name))
+    return sum(len(content.encode('utf-8')) for content in files.values())
+
+# Function to generate the star rating string
+def generate_stars(rating_value):
+    full_stars = int(rating_value)
+    half_star = rating_value - full_stars >= 0.5
+    empty_stars = 5 - full_stars - (1 if half_star else 0)
+    
+    stars_html = '★' * full_stars
+    if half_star:
+        stars_html += '½'
+    stars_html += '☆' * empty_stars
+    return stars_html
+
+# Rendered restaurant cards by (restaurant id, link depth); a restaurant appears on several
+# listing pages and as a similar restaurant, so each card is rendered once per process
+card_cache = {}
+
+# Function to get the HTML for a restaurant card, rendering it on first use
+def generate_restaurant_card(restaurant, level=0):
+    key = (id(restaurant), level)
+    card_html = card_cache.get(key)
+    if card_html is None:
+        card_html = card_cache[key] = render_restaurant_card(restaurant, level)
+    return card_html
+
+# Function to render HTML for a restaurant card with proper relative paths
+def render_restaurant_card(restaurant, level=0):
+    # Generate star rating
+    stars_html = generate_stars(restaurant.rating)
+    
+    # Default image if none provided
+    image_url = restaurant.photo if restaurant.photo else 'https://via.placeholder.com/300x180?text=No+Image'
+    
+    # Price range
+    price_html = restaurant.price_range if restaurant.price_range else ''
+    
+    # Website button - changed from text link to a button
+    website_html = f'<a href="{restaurant.website}" target="_blank">Visit Website</a>' if restaurant.website else ''
+    
+    # Create a slug for the restaurant name
+    restaurant_slug = restaurant.slug
+    
+    # Link to the restaurant page from a page `level` folders deep
+    link_path = site_url(f"restaurant/{restaurant_slug}.html", level)
+    
+    return f'''
+    <div class="restaurant-card">
+        <div class="restaurant-image">
+            <img src="{image_url}" alt="{restaurant.name}">
+        </div>
+        <h3><a href="{link_path}">{restaurant.name}</a></h3>
+        <div class="restaurant-details">
+            <div class="rating">
+                <span class="stars">{stars_html}</span>
+                <span class="rating-value">{restaurant.rating}</span>
+                <span class="reviews">({restaurant.reviews} reviews)</span>
+                <span class="price">{price_html}</span>
+            </div>
+            <div class="type">{restaurant.type}</div>
+            <div class="address">{restaurant.address}</div>
+            <div class="contact">
+                {website_html}
+                {f'<span class="phone">{restaurant.phone}</span>' if restaurant.phone else ''}
+            </div>
+        </div>
+    </div>
+    '''
+
+# Function to generate navigation menu with dropdowns
+def generate_menu(current_area=None, current_category=None, level=0):
+    # Create areas dropdown
+    areas_dropdown = f'''
+    <div class="dropdown">
+        <button class="dropdown-button">Areas ▼</button>
+        <div class="dropdown-content">
+    '''
+    
+    for area in AREAS:
+        area_slug = area.lower().replace(' ', '-')
+        is_current = current_area and current_area.lower() == area.lower()
+        
+        areas_dropdown += f'<a href="{site_url(f"{area_slug}/index.html", level)}"{" class=\"active\"" if is_current else ""}>{area}</a>\n'
+    
+    areas_dropdown += '''
+        </div>
+    </div>
+    '''
+    
+    # Create categories dropdown
+    categories_dropdown = f'''
+    <div class="dropdown">
+        <button class="dropdown-button">Cuisines ▼</button>
+        <div class="dropdown-content">
+    '''
+    
+    for category in CATEGORIES:
+        category_slug = category.lower()
+        categories_dropdown += f'<a href="{site_url(f"{category_slug}/index.html", level)}">{category}</a>\n'
+    
+    categories_dropdown += '''
+        </div>
+    </div>
+    '''
+    
+    return f'''
+    <div class="dropdown-menus">
+        {areas_dropdown}
+        {categories_dropdown}
+    </div>
+    '''
+
+# Function to generate the search box, which loads the search index lazily on the first query
+def generate_search_box(level=0):
+    return f'''
+        <div class="site-search" data-index="{site_url(f'{SEARCH_DIR}/', level)}" data-restaurant-url="{site_url('restaurant/{slug}.html', level)}">
+            <input type="search" placeholder="Search restaurants" aria-label="Search restaurants">
+            <ul class="site-search-results"></ul>
+            <script src="{site_url(f'{SEARCH_DIR}/search.js', level)}" defer></script>
+        </div>
+    '''
+
+# Function to generate header with logo and dropdown menus
+def generate_header(level=0):
+    return f'''
+    <header>
+        <div class="logo">
+            <a href="{site_url('index.html', level)}">
+                <img src="{site_url(SITE_LOGO, level)}" alt="{SITE_NAME}">
+            </a>
+        </div>
+        {generate_search_box(level)}
+        {generate_menu(level=level)}
+    </header>
+    '''
+
+# Function to generate HTML head section with correct CSS path
+def generate_head(title, description, keywords, level=0, head_links=''):
+    return f'''
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <meta name="description" content="{description}">
+        <meta name="keywords" content="{keywords}">
+        <title>{title} - {SITE_NAME}</title>
+        <link rel="stylesheet" href="{site_url(STYLESHEET_FILE, level)}">
+        <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600;700&display=swap" rel="stylesheet">
+        <link rel="icon" type="image/x-icon" href="{site_url(SITE_FAVICON, level)}">
+        {head_links}
+    </head>
+    '''
+
+# Function to generate footer with three columns of restaurants
+# The footer only depends on the loaded data, so it is rendered once per level and process (see set_build_data)
+@functools.cache
+def generate_footer(level=0):
+    # Get top breakfast restaurants
+    breakfast_restaurants = heapq.nlargest(
+        5,
+        (restaurant for area in restaurants_by_area for restaurant in restaurants_by_area[area]
+         if 'breakfast' in restaurant.type.lower() or 'breakfast' in restaurant.category.lower()),
+        key=lambda x: x.score
+    )
+    
+    # Only the top 17 by score are needed for the lunch and dinner columns
+    top_restaurants = heapq.nlargest(
+        17,
+        (restaurant for area in restaurants_by_area for restaurant in restaurants_by_area[area]),
+        key=lambda x: x.score
+    )
+    
+    # Get top lunch restaurants (using score as proxy)
+    lunch_restaurants = top_restaurants[6:11]  # Skip the top 6 to get different restaurants
+    
+    # Get top dinner restaurants (using score as proxy, different set)
+    dinner_restaurants = top_restaurants[12:17]  # Skip more to get different restaurants
+    
+    footer_html = '''
+    <footer>
+        <div class="container">
+            <div class="footer-columns">
+                <div class="footer-column">
+                    <h3>Best Breakfast in Zurich</h3>
+                    <ul class="footer-list">
+    '''
+    
+    # Add breakfast restaurants
+    for restaurant in breakfast_restaurants:
+        footer_html += f'<li><a href="#">{restaurant.name}</a></li>\n'
+    
+    footer_html += '''
+                    </ul>
+                </div>
+                <div class="footer-column">
+                    <h3>Best Lunch in Zurich</h3>
+                    <ul class="footer-list">
+    '''
+    
+    # Add lunch restaurants
+    for restaurant in lunch_restaurants:
+        footer_html += f'<li><a href="#">{restaurant.name}</a></li>\n'
     
     footer_html += '''
                     </ul>
@@ -1097,14 +2517,14 @@ def generate_footer():
     
     # Add dinner restaurants
     for restaurant in dinner_restaurants:
-        footer_html += f'<li><a href="#">{restaurant["name"]}</a></li>\n'
+        footer_html += f'<li><a href="#">{restaurant.name}</a></li>\n'
     
-    footer_html += '''
+    footer_html += f'''
                     </ul>
                 </div>
             </div>
             <div class="footer-sitemap">
-                <a href="sitemap.html">Sitemap</a>
+                <a href="{site_url('sitemap.html', level)}">Sitemap</a>
             </div>
         </div>
     </footer>
@@ -1115,11 +2535,11 @@ def generate_footer():
 # Function to generate a carousel with 3 images
 def generate_carousel(restaurant):
     # Use the main photo as the first image
-    main_image = restaurant['photo'] if restaurant['photo'] else 'https://via.placeholder.com/800x400?text=No+Image'
+    main_image = restaurant.photo if restaurant.photo else 'https://via.placeholder.com/800x400?text=No+Image'
     
     # Generate 2 more random images related to the restaurant type
-    restaurant_type = restaurant['type'].lower() if restaurant['type'] else 'restaurant'
-    category = restaurant['category'].lower() if restaurant['category'] else 'food'
+    restaurant_type = restaurant.type.lower() if restaurant.type else 'restaurant'
+    category = restaurant.category.lower() if restaurant.category else 'food'
     
     # Use Unsplash for additional images
     image2 = f'https://source.unsplash.com/random/800x400/?{restaurant_type}'
@@ -1129,13 +2549,13 @@ def generate_carousel(restaurant):
     <div class="carousel">
         <div class="carousel-inner">
             <div class="carousel-item">
-                <img src="{main_image}" alt="{restaurant['name']}">
+                <img src="{main_image}" alt="{restaurant.name}">
             </div>
             <div class="carousel-item">
-                <img src="{image2}" alt="{restaurant['name']} {restaurant_type}">
+                <img src="{image2}" alt="{restaurant.name} {restaurant_type}">
             </div>
             <div class="carousel-item">
-                <img src="{image3}" alt="{restaurant['name']} {category}">
+                <img src="{image3}" alt="{restaurant.name} {category}">
             </div>
         </div>
         <button class="carousel-control prev" onclick="moveCarousel(-1)">❮</button>
@@ -1144,39 +2564,36 @@ def generate_carousel(restaurant):
     '''
 
 # Function to generate individual restaurant pages
-def generate_restaurant_page(restaurant, all_restaurants):
+def generate_restaurant_page(restaurant, similar_index, spatial_index):
     # Create a slug for the restaurant name
-    restaurant_slug = re.sub(r'[^a-zA-Z0-9]', '-', restaurant['name'].lower())
-    restaurant_slug = re.sub(r'-+', '-', restaurant_slug).strip('-')
+    restaurant_slug = restaurant.slug
     
     # Generate star rating
-    rating_value = float(restaurant['rating']) if restaurant['rating'] else 0
-    full_stars = int(rating_value)
-    half_star = rating_value - full_stars >= 0.5
-    empty_stars = 5 - full_stars - (1 if half_star else 0)
-    
-    stars_html = '★' * full_stars
-    if half_star:
-        stars_html += '½'
-    stars_html += '☆' * empty_stars
+    stars_html = generate_stars(restaurant.rating)
     
     # Price range
-    price_html = restaurant['price_range'] if restaurant['price_range'] else ''
+    price_html = restaurant.price_range if restaurant.price_range else ''
     
     # Website button
-    website_html = f'<a href="{restaurant["website"]}" target="_blank" class="website-btn">Visit Website</a>' if restaurant["website"] else ''
+    website_html = f'<a href="{restaurant.website}" target="_blank" class="website-btn">Visit Website</a>' if restaurant.website else ''
     
-    # Find similar restaurants (same category or area)
+    # Find similar restaurants (closest in the same category, or same category or address)
     similar_restaurants = []
-    for r in all_restaurants:
-        if r['name'] != restaurant['name'] and (r['category'] == restaurant['category'] or r['address'].lower().find(restaurant['address'].lower()) != -1):
-            similar_restaurants.append(r)
-    
-    # Shuffle and take up to 3
-    random.shuffle(similar_restaurants)
-    similar_restaurants = similar_restaurants[:3]
-    
-    # Generate HTML for similar restaurants with custom card generation
+    if SIMILAR_RESTAURANTS_MODE == 'nearby':
+        similar_restaurants = find_nearby_restaurants(restaurant, spatial_index, SIMILAR_RESTAURANTS_COUNT)
+    if len(similar_restaurants) < SIMILAR_RESTAURANTS_COUNT:
+        # Top up from the random picks when there are not enough places nearby
+        for r in find_similar_restaurants(restaurant, similar_index, SIMILAR_RESTAURANTS_COUNT, similar_seed):
+            if len(similar_restaurants) < SIMILAR_RESTAURANTS_COUNT and r not in similar_restaurants:
+                similar_restaurants.append(r)
+    
+    # Skip rendering when neither the restaurant nor its similar restaurants changed
+    page_path = f"restaurant/{restaurant_slug}.html"
+    inputs_hash = hash_page_inputs(restaurant, similar_restaurants)
+    if page_is_current(page_path, inputs_hash):
+        return page_path, inputs_hash, None
+    
+    # Generate HTML for similar restaurants
     similar_html = ''
     if similar_restaurants:
         similar_html = '''
@@ -1185,54 +2602,9 @@ def generate_restaurant_page(restaurant, all_restaurants):
             <div class="restaurant-list">
         '''
         
-        # Generate custom cards for similar restaurants with correct paths
+        # Restaurant pages are one level deep, like the area pages
         for r in similar_restaurants:
-            r_slug = re.sub(r'[^a-zA-Z0-9]', '-', r['name'].lower())
-            r_slug = re.sub(r'-+', '-', r_slug).strip('-')
-            
-            # Generate star rating for this restaurant
-            r_rating_value = float(r['rating']) if r['rating'] else 0
-            r_full_stars = int(r_rating_value)
-            r_half_star = r_rating_value - r_full_stars >= 0.5
-            r_empty_stars = 5 - r_full_stars - (1 if r_half_star else 0)
-            
-            r_stars_html = '★' * r_full_stars
-            if r_half_star:
-                r_stars_html += '½'
-            r_stars_html += '☆' * r_empty_stars
-            
-            # Default image if none provided
-            r_image_url = r['photo'] if r['photo'] else 'https://via.placeholder.com/300x180?text=No+Image'
-            
-            # Price range
-            r_price_html = r['price_range'] if r['price_range'] else ''
-            
-            # Website button
-            r_website_html = f'<a href="{r["website"]}" target="_blank">Visit Website</a>' if r["website"] else ''
-            
-            # Add card with correct path to the similar restaurant
-            similar_html += f'''
-            <div class="restaurant-card">
-                <div class="restaurant-image">
-                    <img src="{r_image_url}" alt="{r['name']}">
-                </div>
-                <h3><a href="../restaurant/{r_slug}.html">{r['name']}</a></h3>
-                <div class="restaurant-details">
-                    <div class="rating">
-                        <span class="stars">{r_stars_html}</span>
-                        <span class="rating-value">{r['rating']}</span>
-                        <span class="reviews">({r['reviews']} reviews)</span>
-                        <span class="price">{r_price_html}</span>
-                    </div>
-                    <div class="type">{r['type']}</div>
-                    <div class="address">{r['address']}</div>
-                    <div class="contact">
-                        {r_website_html}
-                        {f'<span class="phone">{r["phone"]}</span>' if r["phone"] else ''}
-                    </div>
-                </div>
-            </div>
-            '''
+            similar_html += generate_restaurant_card(r, level=1)
         
         similar_html += '''
             </div>
@@ -1240,429 +2612,46 @@ def generate_restaurant_page(restaurant, all_restaurants):
         '''
     
     # Main image
-    main_image = restaurant['photo'] if restaurant['photo'] else 'https://via.placeholder.com/800x400?text=No+Image'
+    main_image = restaurant.photo if restaurant.photo else 'https://via.placeholder.com/800x400?text=No+Image'
     
     # Generate area links with correct paths
     area_links = ''
     for area in AREAS:
         area_slug = area.lower().replace(' ', '-')
-        area_links += f'<a href="../{area_slug}/index.html">{area}</a>'
+        area_links += f'<a href="{site_url(f"{area_slug}/index.html", 1)}">{area}</a>'
     
     # Generate category links with correct paths
     category_links = ''
     for category in CATEGORIES:
         category_slug = category.lower()
-        category_links += f'<a href="../{category_slug}/index.html">{category}</a>'
+        category_links += f'<a href="{site_url(f"{category_slug}/index.html", 1)}">{category}</a>'
+    home_url = site_url('index.html', 1)
     
-    # Generate the restaurant page HTML with inline styles
+    # Generate the restaurant page HTML
     page_html = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="Visit {restaurant['name']}, a {restaurant['type']} in Zurich. {restaurant['rating']} stars with {restaurant['reviews']} reviews.">
-    <meta name="keywords" content="{restaurant['name']}, {restaurant['type']}, restaurant Zurich, dining Zurich">
-    <title>{restaurant['name']} - {SITE_NAME}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            font-family: 'Montserrat', 'Helvetica Neue', Arial, sans-serif;
-        }}
-
-        body {{
-            background-color: #f8f9fa;
-            color: #333;
-            line-height: 1.6;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-
-        header {{
-            background-color: #fff;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            padding: 15px 0;
-            position: sticky;
-            top: 0;
-            z-index: 100;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .logo {{
-            display: flex;
-            align-items: center;
-            padding: 0 20px;
-        }}
-
-        .logo span {{
-            font-size: 1.5rem;
-            font-weight: bold;
-            color: #d32323;
-        }}
-
-        .dropdown-menus {{
-            display: flex;
-            margin-right: 20px;
-        }}
-
-        .dropdown {{
-            position: relative;
-            margin-left: 15px;
-        }}
-
-        .dropdown-button {{
-            background-color: #d32323;
-            color: white;
-            padding: 10px 15px;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            font-weight: bold;
-        }}
-
-        .dropdown-content {{
-            display: none;
-            position: absolute;
-            right: 0;
-            background-color: #f9f9f9;
-            min-width: 160px;
-            box-shadow: 0px 8px 16px 0px rgba(0,0,0,0.2);
-            z-index: 1;
-            max-height: 400px;
-            overflow-y: auto;
-        }}
-
-        .dropdown-content a {{
-            color: black;
-            padding: 12px 16px;
-            text-decoration: none;
-            display: block;
-            text-align: left;
-        }}
-
-        .dropdown-content a:hover {{
-            background-color: #f1f1f1;
-        }}
-
-        .dropdown:hover .dropdown-content {{
-            display: block;
-        }}
-
-        .dropdown:hover .dropdown-button {{
-            background-color: #b01d1d;
-        }}
-
-        .restaurant-header {{
-            position: relative;
-            height: 400px;
-            overflow: hidden;
-            margin-bottom: 30px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-
-        .restaurant-header img {{
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-        }}
-
-        .restaurant-header-overlay {{
-            position: absolute;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            background: linear-gradient(transparent, rgba(0,0,0,0.8));
-            padding: 30px 20px 20px;
-            color: white;
-        }}
-
-        .restaurant-header-overlay h1 {{
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-        }}
-
-        .restaurant-meta {{
-            display: flex;
-            align-items: center;
-            flex-wrap: wrap;
-            margin-bottom: 10px;
-        }}
-
-        .stars {{
-            color: #f8ce0b;
-            margin-right: 5px;
-        }}
-
-        .rating-value {{
-            font-weight: bold;
-            margin-right: 5px;
-        }}
-
-        .reviews {{
-            color: #ddd;
-            font-size: 0.9rem;
-            margin-right: 15px;
-        }}
-
-        .restaurant-category {{
-            background-color: rgba(255,255,255,0.2);
-            padding: 5px 10px;
-            border-radius: 20px;
-            font-size: 0.9rem;
-            margin-right: 10px;
-        }}
-
-        .restaurant-price {{
-            color: #2a9d38;
-            font-weight: bold;
-        }}
-
-        .restaurant-content {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 30px;
-            margin-bottom: 40px;
-        }}
-
-        .restaurant-info {{
-            flex: 2;
-            min-width: 300px;
-            background-color: white;
-            border-radius: 8px;
-            padding: 30px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-
-        .restaurant-info h2 {{
-            font-size: 1.5rem;
-            margin-bottom: 15px;
-            color: #333;
-            text-align: left;
-        }}
-
-        .restaurant-info p {{
-            margin-bottom: 20px;
-            color: #555;
-        }}
-
-        .restaurant-contact {{
-            margin-top: 30px;
-        }}
-
-        .website-btn {{
-            display: inline-block;
-            background-color: #d32323;
-            color: white;
-            padding: 10px 20px;
-            border-radius: 4px;
-            text-decoration: none;
-            font-weight: bold;
-            transition: background-color 0.3s;
-        }}
-
-        .website-btn:hover {{
-            background-color: #b01d1d;
-        }}
-
-        .phone {{
-            display: block;
-            margin-top: 10px;
-            color: #555;
-        }}
-
-        .featured-restaurants {{
-            margin: 40px 0;
-        }}
-
-        .featured-restaurants h2 {{
-            text-align: center;
-            margin-bottom: 20px;
-        }}
-
-        .restaurant-list {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
-        }}
-
-        .restaurant-card {{
-            background-color: white;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            transition: transform 0.3s;
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .restaurant-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        }}
-
-        .restaurant-image {{
-            height: 180px;
-            overflow: hidden;
-        }}
-
-        .restaurant-image img {{
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-            transition: transform 0.3s;
-        }}
-
-        .restaurant-card:hover .restaurant-image img {{
-            transform: scale(1.05);
-        }}
-
-        .restaurant-card h3 {{
-            padding: 15px;
-            background-color: #f8f9fa;
-            border-bottom: 1px solid #eee;
-        }}
-
-        .restaurant-card h3 a {{
-            color: #333;
-            text-decoration: none;
-        }}
-
-        .restaurant-details {{
-            padding: 15px;
-            flex-grow: 1;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .rating {{
-            margin-bottom: 10px;
-            display: flex;
-            align-items: center;
-        }}
-
-        .type, .address {{
-            margin-bottom: 5px;
-            color: #555;
-        }}
-
-        .contact {{
-            margin-top: auto;
-            padding-top: 10px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .contact a {{
-            color: white;
-            text-decoration: none;
-            background-color: #d32323;
-            padding: 8px 15px;
-            border-radius: 4px;
-            font-weight: bold;
-            transition: background-color 0.3s;
-        }}
-
-        .contact a:hover {{
-            background-color: #b01d1d;
-        }}
-
-        footer {{
-            background-color: #333;
-            color: white;
-            padding: 40px 0;
-            margin-top: 40px;
-        }}
-
-        .footer-columns {{
-            display: flex;
-            justify-content: space-between;
-            flex-wrap: wrap;
-        }}
-
-        .footer-column {{
-            flex: 1;
-            min-width: 250px;
-            margin-bottom: 20px;
-            padding: 0 15px;
-        }}
-
-        .footer-column h3 {{
-            color: #fff;
-            margin-bottom: 20px;
-            font-size: 1.2rem;
-            text-align: center;
-        }}
-
-        .footer-list {{
-            list-style: none;
-        }}
-
-        .footer-list li {{
-            margin-bottom: 10px;
-        }}
-
-        .footer-list a {{
-            color: #ddd;
-            text-decoration: none;
-            transition: color 0.3s;
-        }}
-
-        .footer-list a:hover {{
-            color: #d32323;
-            text-decoration: underline;
-        }}
-
-        @media (max-width: 768px) {{
-            .restaurant-header {{
-                height: 300px;
-            }}
-            
-            .restaurant-header-overlay h1 {{
-                font-size: 1.8rem;
-            }}
-            
-            .restaurant-content {{
-                flex-direction: column;
-            }}
-            
-            .restaurant-list {{
-                grid-template-columns: 1fr;
-            }}
-            
-            .dropdown-menus {{
-                flex-direction: column;
-            }}
-            
-            .dropdown {{
-                margin-bottom: 10px;
-            }}
-        }}
-    </style>
+    <meta name="description" content="Visit {restaurant.name}, a {restaurant.type} in Zurich. {restaurant.rating} stars with {restaurant.reviews} reviews.">
+    <meta name="keywords" content="{restaurant.name}, {restaurant.type}, restaurant Zurich, dining Zurich">
+    <title>{restaurant.name} - {SITE_NAME}</title>
+    <link rel="stylesheet" href="{site_url(STYLESHEET_FILE, 1)}">
     <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600;700&display=swap" rel="stylesheet">
 </head>
-<body>
+<body class="restaurant-page">
     <header>
         <div class="logo">
-            <a href="../index.html" style="text-decoration: none;">
+            <a href="{home_url}" style="text-decoration: none;">
                 <span>{SITE_NAME}</span>
             </a>
         </div>
+        {generate_search_box(1)}
         <div class="dropdown-menus">
             <div class="dropdown">
                 <button class="dropdown-button">Areas ▼</button>
                 <div class="dropdown-content">
-                    <a href="../index.html">Home</a>
+                    <a href="{home_url}">Home</a>
                     {area_links}
                 </div>
             </div>
@@ -1677,14 +2666,14 @@ def generate_restaurant_page(restaurant, all_restaurants):
     
     <div class="container">
         <div class="restaurant-header">
-            <img src="{main_image}" alt="{restaurant['name']}">
+            <img src="{main_image}" alt="{restaurant.name}">
             <div class="restaurant-header-overlay">
-                <h1>{restaurant['name']}</h1>
+                <h1>{restaurant.name}</h1>
                 <div class="restaurant-meta">
                     <span class="stars">{stars_html}</span>
-                    <span class="rating-value">{restaurant['rating']}</span>
-                    <span class="reviews">({restaurant['reviews']} reviews)</span>
-                    <span class="restaurant-category">{restaurant['type']}</span>
+                    <span class="rating-value">{restaurant.rating}</span>
+                    <span class="reviews">({restaurant.reviews} reviews)</span>
+                    <span class="restaurant-category">{restaurant.type}</span>
                     <span class="restaurant-price">{price_html}</span>
                 </div>
             </div>
@@ -1693,12 +2682,12 @@ def generate_restaurant_page(restaurant, all_restaurants):
         <div class="restaurant-content">
             <div class="restaurant-info">
                 <h2>Location</h2>
-                <p>{restaurant['address']}</p>
+                <p>{restaurant.address}</p>
                 
                 <h2>Contact</h2>
                 <div class="restaurant-contact">
                     {website_html}
-                    {f'<div class="phone">{restaurant["phone"]}</div>' if restaurant["phone"] else ''}
+                    {f'<div class="phone">{restaurant.phone}</div>' if restaurant.phone else ''}
                 </div>
             </div>
         </div>
@@ -1712,24 +2701,24 @@ def generate_restaurant_page(restaurant, all_restaurants):
                 <div class="footer-column">
                     <h3>Best Breakfast in Zurich</h3>
                     <ul class="footer-list">
-                        <li><a href="../breakfast/index.html">View All Breakfast Places</a></li>
+                        <li><a href="{site_url('breakfast/index.html', 1)}">View All Breakfast Places</a></li>
                     </ul>
                 </div>
                 <div class="footer-column">
                     <h3>Best Lunch in Zurich</h3>
                     <ul class="footer-list">
-                        <li><a href="../index.html">View Top Rated Restaurants</a></li>
+                        <li><a href="{home_url}">View Top Rated Restaurants</a></li>
                     </ul>
                 </div>
                 <div class="footer-column">
                     <h3>Best Dinner in Zurich</h3>
                     <ul class="footer-list">
-                        <li><a href="../index.html">View Top Rated Restaurants</a></li>
+                        <li><a href="{home_url}">View Top Rated Restaurants</a></li>
                     </ul>
                 </div>
             </div>
             <div class="footer-sitemap">
-                <a href="sitemap.html">Sitemap</a>
+                <a href="{site_url('sitemap.html', 1)}">Sitemap</a>
             </div>
         </div>
     </footer>
@@ -1738,11 +2727,11 @@ def generate_restaurant_page(restaurant, all_restaurants):
 '''
     
     # Write the HTML to a file
-    with open(os.path.join(OUTPUT_DIR, 'restaurant', f"{restaurant_slug}.html"), 'w', encoding='utf-8') as f:
-        f.write(page_html)
+    return page_path, inputs_hash, write_page(page_path, page_html)
 
-# Generate homepage
-homepage_html = f'''<!DOCTYPE html>
+# Function to generate the homepage
+def generate_homepage():
+    homepage_html = f'''<!DOCTYPE html>
 <html lang="en">
 {generate_head("Best Restaurants in Zurich", 
                "Find the best restaurants in Zurich, Switzerland. Discover top-rated places for breakfast, lunch, and dinner.",
@@ -1767,32 +2756,32 @@ homepage_html = f'''<!DOCTYPE html>
             <div class="category-grid">
 '''
 
-# Add category cards to homepage with fixed images
-category_images = {
-    'Italian': 'https://images.unsplash.com/photo-1595295333158-4742f28fbd85?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'Chinese': 'https://images.unsplash.com/photo-1563245372-f21724e3856d?ixlib=rb-4.0.3&auto=format&fit=crop&w=1742&q=80',
-    'Japanese': 'https://images.unsplash.com/photo-1579871494447-9811cf80d66c?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'Swiss': 'https://images.unsplash.com/photo-1414235077428-338989a2e8c0?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'French': 'https://images.unsplash.com/photo-1555396273-367ea4eb4db5?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'Indian': 'https://images.unsplash.com/photo-1505253758473-96b7015fcd40?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'Thai': 'https://images.unsplash.com/photo-1559847844-5315695dadae?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'Mexican': 'https://images.unsplash.com/photo-1565299624946-b28f40a0ae38?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'Vegetarian': 'https://images.unsplash.com/photo-1512621776951-a57141f2eefd?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
-    'Breakfast': 'https://images.unsplash.com/photo-1484723091739-30a097e8f929?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80'
-}
-
-for category in CATEGORIES:
-    category_slug = category.lower()
-    image_url = category_images.get(category, 'https://images.unsplash.com/photo-1414235077428-338989a2e8c0?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80')
-    
-    homepage_html += f'''
-                <a href="{category_slug}/index.html" class="category-card">
+    # Add category cards to homepage with fixed images
+    category_images = {
+        'Italian': 'https://images.unsplash.com/photo-1595295333158-4742f28fbd85?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'Chinese': 'https://images.unsplash.com/photo-1563245372-f21724e3856d?ixlib=rb-4.0.3&auto=format&fit=crop&w=1742&q=80',
+        'Japanese': 'https://images.unsplash.com/photo-1579871494447-9811cf80d66c?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'Swiss': 'https://images.unsplash.com/photo-1414235077428-338989a2e8c0?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'French': 'https://images.unsplash.com/photo-1555396273-367ea4eb4db5?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'Indian': 'https://images.unsplash.com/photo-1505253758473-96b7015fcd40?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'Thai': 'https://images.unsplash.com/photo-1559847844-5315695dadae?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'Mexican': 'https://images.unsplash.com/photo-1565299624946-b28f40a0ae38?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'Vegetarian': 'https://images.unsplash.com/photo-1512621776951-a57141f2eefd?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80',
+        'Breakfast': 'https://images.unsplash.com/photo-1484723091739-30a097e8f929?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80'
+    }
+
+    for category in CATEGORIES:
+        category_slug = category.lower()
+        image_url = category_images.get(category, 'https://images.unsplash.com/photo-1414235077428-338989a2e8c0?ixlib=rb-4.0.3&auto=format&fit=crop&w=1740&q=80')
+        
+        homepage_html += f'''
+                <a href="{site_url(f"{category_slug}/index.html")}" class="category-card">
                     <img src="{image_url}" alt="{category} Food">
                     <h3>{category}</h3>
                 </a>
     '''
 
-homepage_html += '''
+    homepage_html += '''
             </div>
         </section>
         
@@ -1801,19 +2790,14 @@ homepage_html += '''
             <div class="restaurant-list">
 '''
 
-# Get top 6 restaurants across all areas
-all_restaurants = []
-for area in restaurants_by_area:
-    all_restaurants.extend(restaurants_by_area[area])
-
-all_restaurants.sort(key=lambda x: float(x['score']), reverse=True)
-top_restaurants = all_restaurants[:6]
+    # Get top 6 restaurants across all areas
+    top_restaurants = heapq.nlargest(6, all_restaurants, key=lambda x: x.score)
 
-# Add top restaurant cards to homepage
-for restaurant in top_restaurants:
-    homepage_html += generate_restaurant_card(restaurant, level=0)
+    # Add top restaurant cards to homepage
+    for restaurant in top_restaurants:
+        homepage_html += generate_restaurant_card(restaurant, level=0)
 
-homepage_html += '''
+    homepage_html += f'''
             </div>
         </section>
         
@@ -1821,19 +2805,19 @@ homepage_html += '''
             <h2>Best Restaurants in Zurich Old Town</h2>
             <p class="section-intro">
                 Zurich's Old Town has some of the best restaurants in the city. You'll find everything from traditional Swiss dishes to international flavors, all in a lively and welcoming atmosphere.
-                <a href="old-town/index.html">View all restaurants in Old Town →</a>
+                <a href="{site_url('old-town/index.html')}">View all restaurants in Old Town →</a>
             </p>
             <div class="restaurant-list">
 '''
 
-# Get top 3 restaurants in Old Town
-old_town_restaurants = restaurants_by_area.get('Old Town', [])[:3]
+    # Get top 3 restaurants in Old Town
+    old_town_restaurants = restaurants_by_area.get('Old Town', [])[:3]
 
-# Add Old Town restaurant cards to homepage
-for restaurant in old_town_restaurants:
-    homepage_html += generate_restaurant_card(restaurant, level=0)
+    # Add Old Town restaurant cards to homepage
+    for restaurant in old_town_restaurants:
+        homepage_html += generate_restaurant_card(restaurant, level=0)
 
-homepage_html += '''
+    homepage_html += f'''
             </div>
         </section>
         
@@ -1841,19 +2825,19 @@ homepage_html += '''
             <h2>Best Restaurants in Zurich Airport</h2>
             <p class="section-intro">
                 If you're at Zurich Airport, there are plenty of good places to eat. Whether you want a quick snack or a proper meal, you'll find quality food without having to leave the airport.
-                <a href="airport/index.html">View all restaurants at Zurich Airport →</a>
+                <a href="{site_url('airport/index.html')}">View all restaurants at Zurich Airport →</a>
             </p>
             <div class="restaurant-list">
 '''
 
-# Get top 3 restaurants in Airport area
-airport_restaurants = restaurants_by_area.get('Airport', [])[:3]
+    # Get top 3 restaurants in Airport area
+    airport_restaurants = restaurants_by_area.get('Airport', [])[:3]
 
-# Add Airport restaurant cards to homepage
-for restaurant in airport_restaurants:
-    homepage_html += generate_restaurant_card(restaurant, level=0)
+    # Add Airport restaurant cards to homepage
+    for restaurant in airport_restaurants:
+        homepage_html += generate_restaurant_card(restaurant, level=0)
 
-homepage_html += '''
+    homepage_html += '''
             </div>
         </section>
         
@@ -1924,39 +2908,104 @@ homepage_html += '''
 </html>
 '''
 
-with open(os.path.join(OUTPUT_DIR, 'index.html'), 'w', encoding='utf-8') as f:
-    f.write(homepage_html)
-
-# Generate area pages
-for area in AREAS:
+    write_if_changed('index.html', homepage_html)
+
+# Function to split an already sorted listing into pages of listing_page_size restaurants (always at least one page)
+def paginate(restaurants):
+    return [restaurants[start:start + listing_page_size]
+            for start in range(0, len(restaurants), listing_page_size)] or [[]]
+
+# Function to get the folder of a listing page: the listing folder for page 1, <folder>/page/<n> after that
+def listing_page_dir(listing_dir, page_number):
+    return listing_dir if page_number == 1 else f"{listing_dir}/page/{page_number}"
+
+# Function to generate the rel=prev/next head links and the page navigation of a listing page
+def generate_pagination(listing_dir, page_number, page_count, level):
+    if page_count == 1:
+        return '', ''
+    
+    def page_url(number):
+        return site_url(f"{listing_page_dir(listing_dir, number)}/index.html", level)
+    
+    head_links = ''
+    pagination_html = '<nav class="pagination">\n'
+    if page_number > 1:
+        head_links += f'<link rel="prev" href="{page_url(page_number - 1)}">\n'
+        pagination_html += f'<a href="{page_url(page_number - 1)}" rel="prev">← Previous</a>\n'
+    
+    # Link the first and last pages and the two pages on either side of this one
+    shown = sorted({1, page_count, *range(max(1, page_number - 2), min(page_count, page_number + 2) + 1)})
+    for position, number in enumerate(shown):
+        if position and number - shown[position - 1] > 1:
+            pagination_html += '<span class="gap">…</span>\n'
+        if number == page_number:
+            pagination_html += f'<span class="current">{number}</span>\n'
+        else:
+            pagination_html += f'<a href="{page_url(number)}">{number}</a>\n'
+    
+    if page_number < page_count:
+        head_links += f'<link rel="next" href="{page_url(page_number + 1)}">\n'
+        pagination_html += f'<a href="{page_url(page_number + 1)}" rel="next">Next →</a>\n'
+    pagination_html += '</nav>\n'
+    return head_links, pagination_html
+
+# Function to generate every page of a listing with render_page(page_number, page_restaurants, page_count)
+def generate_listing_pages(listing_dir, restaurants, render_page):
+    pages = paginate(restaurants)
+    entries = []
+    for page_number, page_restaurants in enumerate(pages, 1):
+        if page_number > 1:
+            make_output_dir(listing_page_dir(listing_dir, page_number))
+        entries.append(render_page(page_number, page_restaurants, len(pages)))
+    return entries
+
+# Function to generate the listing pages for an area
+def generate_area_index_pages(area):
     area_slug = area.lower().replace(' ', '-')
-    area_dir = os.path.join(OUTPUT_DIR, area_slug)
     
-    # Get restaurants for this area
+    # Get restaurants for this area, already sorted by score
     area_restaurants = restaurants_by_area.get(area, [])
+    return generate_listing_pages(area_slug, area_restaurants,
+                                  lambda *page: generate_area_index_page(area, *page))
+
+# Function to generate one page of the listing for an area
+def generate_area_index_page(area, page_number, page_restaurants, page_count):
+    area_slug = area.lower().replace(' ', '-')
+    page_dir = listing_page_dir(area_slug, page_number)
+    level = page_dir.count('/') + 1
+    
+    # Skip rendering when the listed restaurants, category links and footer are unchanged
+    page_path = f"{page_dir}/index.html"
+    footer_html = generate_footer(level=level)
+    area_categories = [category for category in CATEGORIES if restaurants_by_area_category[area].get(category)]
+    inputs_hash = hash_page_inputs(area, area_categories, page_restaurants, page_number, page_count, footer_html)
+    if page_is_current(page_path, inputs_hash):
+        return page_path, inputs_hash, None
+    head_links, pagination_html = generate_pagination(area_slug, page_number, page_count, level)
+    page_title = f" (Page {page_number})" if page_number > 1 else ''
     
     # Generate area index page
     area_html = f'''<!DOCTYPE html>
 <html lang="en">
-{generate_head(f"Best Restaurants in {area}, Zurich", 
+{generate_head(f"Best Restaurants in {area}, Zurich{page_title}", 
                f"Discover the top-rated restaurants in {area}, Zurich. Find places for breakfast, lunch, and dinner.",
                f"restaurants in {area} Zurich, best restaurants {area}, dining {area} Zurich",
-               level=1)}
+               level=level, head_links=head_links)}
 <body>
-    {generate_header(level=1)}
+    {generate_header(level=level)}
     
     <div class="container">
         <h1 class="page-title">Best Restaurants in {area}, Zurich</h1>
         
         <div class="category-nav">
-            <a href="index.html" class="active">All</a>
+            <a href="{site_url(f"{area_slug}/index.html", level)}" class="active">All</a>
 '''
 
     # Add category links
     for category in CATEGORIES:
         if category in restaurants_by_area_category[area] and restaurants_by_area_category[area][category]:
             category_slug = category.lower()
-            area_html += f'<a href="{category_slug}/index.html">{category}</a>\n'
+            area_html += f'<a href="{site_url(f"{area_slug}/{category_slug}/index.html", level)}">{category}</a>\n'
 
     area_html += '''
         </div>
@@ -1965,110 +3014,152 @@ for area in AREAS:
 '''
 
     # Add restaurant cards
-    for restaurant in area_restaurants[:20]:  # Limit to top 20
-        area_html += generate_restaurant_card(restaurant, level=1)
+    for restaurant in page_restaurants:
+        area_html += generate_restaurant_card(restaurant, level=level)
 
     area_html += '''
         </div>
+        ''' + pagination_html + '''
     </div>
     
-    ''' + generate_footer() + '''
+    ''' + footer_html + '''
 </body>
 </html>
 '''
 
-    with open(os.path.join(area_dir, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(area_html)
+    return page_path, inputs_hash, write_page(page_path, area_html)
+
+# Function to generate the listing pages for one category within an area
+def generate_area_category_pages(area, category):
+    area_slug = area.lower().replace(' ', '-')
+    category_slug = category.lower()
     
-    # Generate category pages for this area
-    for category in CATEGORIES:
-        if category not in restaurants_by_area_category[area] or not restaurants_by_area_category[area][category]:
-            continue
-            
-        category_slug = category.lower()
-        category_dir = os.path.join(area_dir, category_slug)
-        
-        # Get restaurants for this category in this area
-        category_restaurants = restaurants_by_area_category[area][category]
-        
-        # Generate category page
-        category_html = f'''<!DOCTYPE html>
+    # Get restaurants for this category in this area, already sorted by score
+    category_restaurants = restaurants_by_area_category[area][category]
+    return generate_listing_pages(f"{area_slug}/{category_slug}", category_restaurants,
+                                  lambda *page: generate_area_category_page(area, category, *page))
+
+# Function to generate one page of the listing for a category within an area
+def generate_area_category_page(area, category, page_number, page_restaurants, page_count):
+    area_slug = area.lower().replace(' ', '-')
+    category_slug = category.lower()
+    page_dir = listing_page_dir(f"{area_slug}/{category_slug}", page_number)
+    level = page_dir.count('/') + 1
+    
+    # Skip rendering when the listed restaurants, category links and footer are unchanged
+    page_path = f"{page_dir}/index.html"
+    footer_html = generate_footer(level=level)
+    area_categories = [other for other in CATEGORIES if restaurants_by_area_category[area].get(other)]
+    inputs_hash = hash_page_inputs(area, category, area_categories, page_restaurants, page_number, page_count, footer_html)
+    if page_is_current(page_path, inputs_hash):
+        return page_path, inputs_hash, None
+    head_links, pagination_html = generate_pagination(f"{area_slug}/{category_slug}", page_number, page_count, level)
+    page_title = f" (Page {page_number})" if page_number > 1 else ''
+    
+    # Generate category page
+    category_html = f'''<!DOCTYPE html>
 <html lang="en">
-{generate_head(f"Best {category} Restaurants in {area}, Zurich", 
+{generate_head(f"Best {category} Restaurants in {area}, Zurich{page_title}", 
                f"Find the best {category} restaurants in {area}, Zurich. Top-rated {category} dining options.",
                f"best {category} restaurants in {area} Zurich, {category} food {area}, {category} dining Zurich",
-               level=2)}
+               level=level, head_links=head_links)}
 <body>
-    {generate_header(level=2)}
+    {generate_header(level=level)}
     
     <div class="container">
         <h1 class="page-title">Best {category} Restaurants in {area}, Zurich</h1>
         
         <div class="category-nav">
-            <a href="../index.html">All Restaurants in {area}</a>
+            <a href="{site_url(f"{area_slug}/index.html", level)}">All Restaurants in {area}</a>
 '''
 
-        # Add other category links
-        for other_category in CATEGORIES:
-            if other_category == category or other_category not in restaurants_by_area_category[area] or not restaurants_by_area_category[area][other_category]:
-                continue
-                
-            other_category_slug = other_category.lower()
-            category_html += f'<a href="../{other_category_slug}/index.html">{other_category}</a>\n'
+    # Add other category links
+    for other_category in CATEGORIES:
+        if other_category == category or other_category not in restaurants_by_area_category[area] or not restaurants_by_area_category[area][other_category]:
+            continue
+            
+        other_category_slug = other_category.lower()
+        category_html += f'<a href="{site_url(f"{area_slug}/{other_category_slug}/index.html", level)}">{other_category}</a>\n'
 
-        category_html += f'<a href="index.html" class="active">{category}</a>\n'
+    category_html += f'<a href="{site_url(f"{area_slug}/{category_slug}/index.html", level)}" class="active">{category}</a>\n'
 
-        category_html += '''
+    category_html += '''
         </div>
         
         <div class="restaurant-list">
 '''
 
-        # Add restaurant cards
-        for restaurant in category_restaurants[:20]:  # Limit to top 20
-            category_html += generate_restaurant_card(restaurant, level=2)
+    # Add restaurant cards
+    for restaurant in page_restaurants:
+        category_html += generate_restaurant_card(restaurant, level=level)
 
-        category_html += '''
+    category_html += '''
         </div>
+        ''' + pagination_html + '''
     </div>
     
-    ''' + generate_footer() + '''
+    ''' + footer_html + '''
 </body>
 </html>
 '''
 
-        with open(os.path.join(category_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(category_html)
+    return page_path, inputs_hash, write_page(page_path, category_html)
 
-# Generate cuisine category pages at the root level
-for category in CATEGORIES:
-    category_slug = category.lower()
-    category_dir = os.path.join(OUTPUT_DIR, category_slug)
+# Function to generate an area page and its category pages
+def generate_area_pages(area):
+    entries = generate_area_index_pages(area)
+    
+    # Generate category pages for this area
+    for category in CATEGORIES:
+        if category not in restaurants_by_area_category[area] or not restaurants_by_area_category[area][category]:
+            continue
+        entries.extend(generate_area_category_pages(area, category))
     
-    # Get all restaurants for this category across all areas
-    category_restaurants = []
-    for area in restaurants_by_area_category:
-        if category in restaurants_by_area_category[area]:
-            category_restaurants.extend(restaurants_by_area_category[area][category])
+    return entries
+
+# Function to generate the listing pages for a cuisine category at the root level
+def generate_category_pages(category):
+    category_slug = category.lower()
     
-    # Sort by score
-    category_restaurants.sort(key=lambda x: float(x['score']), reverse=True)
+    # Merge the restaurants for this category across all areas, each area's list already sorted by score
+    category_restaurants = list(heapq.merge(
+        *(restaurants_by_area_category[area][category] for area in restaurants_by_area_category
+          if category in restaurants_by_area_category[area]),
+        key=lambda x: x.score, reverse=True
+    ))
+    return generate_listing_pages(category_slug, category_restaurants,
+                                  lambda *page: generate_category_page(category, *page))
+
+# Function to generate one page of the listing for a cuisine category at the root level
+def generate_category_page(category, page_number, page_restaurants, page_count):
+    category_slug = category.lower()
+    page_dir = listing_page_dir(category_slug, page_number)
+    level = page_dir.count('/') + 1
+    
+    # Skip rendering when the listed restaurants and footer are unchanged
+    page_path = f"{page_dir}/index.html"
+    footer_html = generate_footer(level=level)
+    inputs_hash = hash_page_inputs(category, page_restaurants, page_number, page_count, footer_html)
+    if page_is_current(page_path, inputs_hash):
+        return page_path, inputs_hash, None
+    head_links, pagination_html = generate_pagination(category_slug, page_number, page_count, level)
+    page_title = f" (Page {page_number})" if page_number > 1 else ''
     
     # Generate category page
     category_html = f'''<!DOCTYPE html>
 <html lang="en">
-{generate_head(f"Best {category} Restaurants in Zurich", 
+{generate_head(f"Best {category} Restaurants in Zurich{page_title}", 
                f"Find the best {category} restaurants in Zurich. Top-rated {category} dining options across the city.",
                f"best {category} restaurants in Zurich, {category} food Zurich, {category} dining Zurich",
-               level=1)}
+               level=level, head_links=head_links)}
 <body>
-    {generate_header(level=1)}
+    {generate_header(level=level)}
     
     <div class="container">
         <h1 class="page-title">Best {category} Restaurants in Zurich</h1>
         
         <div class="category-nav">
-            <a href="index.html" class="active">{category}</a>
+            <a href="{site_url(f"{category_slug}/index.html", level)}" class="active">{category}</a>
 '''
 
     # Add other category links
@@ -2077,7 +3168,7 @@ for category in CATEGORIES:
             continue
             
         other_category_slug = other_category.lower()
-        category_html += f'<a href="../{other_category_slug}/index.html">{other_category}</a>\n'
+        category_html += f'<a href="{site_url(f"{other_category_slug}/index.html", level)}">{other_category}</a>\n'
 
     category_html += '''
         </div>
@@ -2148,32 +3239,24 @@ for category in CATEGORIES:
 '''
 
     # Add restaurant cards
-    for restaurant in category_restaurants[:20]:  # Limit to top 20
-        category_html += generate_restaurant_card(restaurant, level=1)
+    for restaurant in page_restaurants:
+        category_html += generate_restaurant_card(restaurant, level=level)
 
     category_html += '''
         </div>
+        ''' + pagination_html + '''
     </div>
     
-    ''' + generate_footer() + '''
+    ''' + footer_html + '''
 </body>
 </html>
 '''
 
-    with open(os.path.join(category_dir, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(category_html)
-
-# Process all restaurants and create individual pages
-all_restaurants = []
-for area in restaurants_by_area:
-    all_restaurants.extend(restaurants_by_area[area])
-
-# Create individual restaurant pages
-for restaurant in all_restaurants:
-    generate_restaurant_page(restaurant, all_restaurants)
+    return page_path, inputs_hash, write_page(page_path, category_html)
 
-# Generate a sitemap page
-sitemap_html = f'''<!DOCTYPE html>
+# Function to generate the sitemap page
+def generate_sitemap():
+    sitemap_html = f'''<!DOCTYPE html>
 <html lang="en">
 {generate_head("Sitemap", 
                "Sitemap for Zurich Restaurant Guide. Find all pages and sections of our website.",
@@ -2187,7 +3270,7 @@ sitemap_html = f'''<!DOCTYPE html>
         <div class="sitemap-section">
             <h2>Main Pages</h2>
             <ul class="sitemap-list">
-                <li><a href="index.html">Homepage</a></li>
+                <li><a href="{site_url('index.html')}">Homepage</a></li>
             </ul>
         </div>
         
@@ -2196,11 +3279,11 @@ sitemap_html = f'''<!DOCTYPE html>
             <ul class="sitemap-list">
 '''
 
-for area in AREAS:
-    area_slug = area.lower().replace(' ', '-')
-    sitemap_html += f'                <li><a href="{area_slug}/index.html">{area}</a></li>\n'
+    for area in AREAS:
+        area_slug = area.lower().replace(' ', '-')
+        sitemap_html += f'                <li><a href="{site_url(f"{area_slug}/index.html")}">{area}</a></li>\n'
 
-sitemap_html += '''
+    sitemap_html += '''
             </ul>
         </div>
         
@@ -2209,11 +3292,11 @@ sitemap_html += '''
             <ul class="sitemap-list">
 '''
 
-for category in CATEGORIES:
-    category_slug = category.lower()
-    sitemap_html += f'                <li><a href="{category_slug}/index.html">{category}</a></li>\n'
+    for category in CATEGORIES:
+        category_slug = category.lower()
+        sitemap_html += f'                <li><a href="{site_url(f"{category_slug}/index.html")}">{category}</a></li>\n'
 
-sitemap_html += '''
+    sitemap_html += '''
             </ul>
         </div>
     </div>
@@ -2265,7 +3348,646 @@ sitemap_html += '''
 </html>
 '''
 
-with open(os.path.join(OUTPUT_DIR, 'sitemap.html'), 'w', encoding='utf-8') as f:
-    f.write(sitemap_html)
-
-print(f"Restaurant directory generated in '{OUTPUT_DIR}' folder.") 
\ No newline at end of file
+    write_if_changed('sitemap.html', sitemap_html)
+
+# Function to hash the content of an output file
+def file_content_hash(page_path):
+    with open(os.path.join(OUTPUT_DIR, page_path), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# Function to work out the lastmod date of every page from its content hash: a page keeps the date
+# of the previous build as long as its content is the same, and gets today's date when it changed
+def update_lastmod(content_hashes, previous_lastmod, today):
+    lastmod = {}
+    for page_path, content_hash in content_hashes.items():
+        previous = previous_lastmod.get(page_path)
+        lastmod[page_path] = previous if previous and previous[0] == content_hash else [content_hash, today]
+    return lastmod
+
+# Function to get the absolute URL of a page for the XML sitemap
+def page_location(base_url, page_path):
+    return base_url + (site_url(page_path) if url_mode == 'absolute-clean' else '/' + page_path)
+
+# Function to generate sitemap.xml as a sitemap index over sitemap-<n>.xml files of at most SITEMAP_MAX_URLS URLs
+def generate_xml_sitemaps(lastmod, base_url):
+    from xml.sax.saxutils import escape as xml_escape
+    
+    base_url = base_url.rstrip('/')
+    urls = [(page_location(base_url, page_path), lastmod[page_path][1]) for page_path in sorted(lastmod)]
+    shards = [urls[start:start + SITEMAP_MAX_URLS] for start in range(0, len(urls), SITEMAP_MAX_URLS)]
+    
+    sitemap_index = '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for number, shard in enumerate(shards, 1):
+        file_name = f'sitemap-{number}.xml'
+        urlset = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        for location, date in shard:
+            urlset += f'<url><loc>{xml_escape(location)}</loc><lastmod>{date}</lastmod></url>\n'
+        urlset += '</urlset>\n'
+        write_if_changed(file_name, urlset)
+        sitemap_index += f'<sitemap><loc>{xml_escape(f"{base_url}/{file_name}")}</loc><lastmod>{max(date for _, date in shard)}</lastmod></sitemap>\n'
+    sitemap_index += '</sitemapindex>\n'
+    write_if_changed('sitemap.xml', sitemap_index)
+    
+    # Remove shards left over from a build with more URLs
+    for file_name in list_output_files():
+        match = re.fullmatch(r'sitemap-(\d+)\.xml', file_name)
+        if match and int(match.group(1)) > len(shards):
+            os.remove(os.path.join(OUTPUT_DIR, file_name))
+    return len(urls), len(shards)
+
+# Function to generate the page for the restaurant at a position in all_restaurants
+def generate_restaurant_page_at(position):
+    return [generate_restaurant_page(all_restaurants[position], similar_index, spatial_index)]
+
+# Function to generate the area, category and restaurant pages, optionally in worker processes
+# Returns a (page path, inputs hash, rendered) entry for every page
+def generate_pages(data, jobs=1):
+    tasks = [
+        ('area pages', generate_area_pages, AREAS),
+        ('category pages', generate_category_pages, CATEGORIES),
+        ('restaurant pages', generate_restaurant_page_at, range(len(all_restaurants)))
+    ]
+    
+    # Workers get the restaurant data once through the initializer, tasks only carry an area, category or position
+    executor = None
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=set_build_data, initargs=(data,))
+    
+    entries = []
+    try:
+        for name, function, items in tasks:
+            with build_phase(name) as phase:
+                if executor is None:
+                    results = map(function, items)
+                else:
+                    results = executor.map(function, items, chunksize=max(1, len(items) // (jobs * 4)))
+                for result in results:
+                    entries.extend(result)
+                    for _, _, sizes in result:
+                        if sizes:
+                            phase['pages'] += 1
+                            phase['bytes'] += sizes[1]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return entries
+
+# Function to write the .gz (and .br, when brotli is installed) siblings of an output file,
+# skipping siblings that are newer than the file; returns whether anything was written and the sizes
+def compress_file(path):
+    encoders = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    
+    source_mtime = os.stat(path).st_mtime_ns
+    data = None
+    written = False
+    sizes = [os.path.getsize(path)]
+    for suffix, encode in encoders:
+        sibling = path + suffix
+        if not (os.path.exists(sibling) and os.stat(sibling).st_mtime_ns >= source_mtime):
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            # Replaced by rename, as a staged build may share the old sibling with the live site
+            with open(sibling + '.write-tmp', 'wb') as f:
+                f.write(encode(data))
+            os.replace(sibling + '.write-tmp', sibling)
+            written = True
+        sizes.append(os.path.getsize(sibling))
+    return written, sizes
+
+# Function to precompress every text file in the output directory, dropping siblings of removed files
+def compress_output(jobs=1, site_dir=None):
+    paths = []
+    for root, dirs, files in os.walk(OUTPUT_DIR):
+        for file in files:
+            path = os.path.join(root, file)
+            if file.endswith(('.gz', '.br')):
+                if not os.path.exists(path[:-3]) or (file.endswith('.br') and brotli is None):
+                    os.remove(path)
+            elif file.endswith(COMPRESSIBLE_EXTENSIONS) and file != MANIFEST_FILE:
+                paths.append(path)
+    
+    if jobs <= 1:
+        results = [compress_file(path) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(compress_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    
+    # The snippet goes next to the output folder, not into it, so it is never served
+    site_dir = site_dir or OUTPUT_DIR
+    with open(os.path.join(os.path.dirname(os.path.abspath(site_dir)), NGINX_CONFIG_FILE), 'w', encoding='utf-8') as f:
+        f.write(generate_nginx_config(site_dir))
+    return results
+
+# Function to generate the nginx snippet that serves the precompressed siblings
+def generate_nginx_config(site_dir):
+    config = f'''# Serve the .gz files written by `generate_restaurant_directory.py --compress` for {site_dir}
+gzip_static on;
+gunzip on;
+'''
+    if brotli is not None:
+        config += '''# Needs the ngx_brotli module
+brotli_static on;
+'''
+    return config
+
+# Function to get the folder holding the builds of a staged output folder
+def builds_dir(output_dir):
+    return os.path.normpath(output_dir) + BUILDS_DIR_SUFFIX
+
+# Function to list the finished builds of a staged output folder, oldest first
+def list_builds(output_dir):
+    if not os.path.isdir(builds_dir(output_dir)):
+        return []
+    return sorted(name for name in os.listdir(builds_dir(output_dir))
+                  if not name.endswith(STAGING_SUFFIX) and os.path.isdir(os.path.join(builds_dir(output_dir), name)))
+
+# Function to get the build a staged output folder points at, or None if it is not a link to one
+def live_build(output_dir):
+    if not os.path.islink(output_dir):
+        return None
+    return os.path.basename(os.path.normpath(os.readlink(output_dir)))
+
+# Function to get a build name that is not taken yet: the given one, or it with a -2, -3, ... suffix
+def free_build_name(output_dir, build_name):
+    name = build_name
+    number = 1
+    while os.path.exists(os.path.join(builds_dir(output_dir), name)):
+        number += 1
+        name = f'{build_name}-{number}'
+    return name
+
+# Function to create the staging folder for a new build, named by the build time. Unless fresh is set it starts
+# as a copy of the live site that shares its files (see sync_output.py), so an incremental build only rewrites
+# what changed; the build must then replace files by rename rather than write into them (atomic_writes).
+def create_staging_dir(output_dir, fresh=False):
+    os.makedirs(builds_dir(output_dir), exist_ok=True)
+    # Drop staging folders of builds that never finished
+    for name in os.listdir(builds_dir(output_dir)):
+        if name.endswith(STAGING_SUFFIX):
+            shutil.rmtree(os.path.join(builds_dir(output_dir), name))
+    
+    build_name = free_build_name(output_dir, time.strftime('%Y%m%dT%H%M%SZ', time.gmtime()))
+    staging_dir = os.path.join(builds_dir(output_dir), build_name + STAGING_SUFFIX)
+    os.makedirs(staging_dir)
+    if not fresh and os.path.isdir(output_dir):
+        from sync_output import sync_tree
+        # Staged builds replace files by rename, so the staging folder can hardlink to the live site
+        sync_tree(output_dir, staging_dir, hardlink=True)
+    return staging_dir
+
+# Function to point a staged output folder at one of its builds by swapping in a new symlink, which is atomic:
+# readers see either the old build or the new one. The link is relative, so the folders can be moved together.
+def switch_live_build(output_dir, build_name):
+    output_dir = os.path.normpath(output_dir)
+    temp_link = output_dir + '.link-tmp'
+    if os.path.lexists(temp_link):
+        os.remove(temp_link)
+    os.symlink(os.path.join(os.path.basename(builds_dir(output_dir)), build_name), temp_link, target_is_directory=True)
+    os.replace(temp_link, output_dir)
+
+# Function to move a real output folder from an unstaged build into the builds folder, named by its mtime, as it
+# can't be swapped for a symlink atomically; returns the name it was kept under, or None if there was none
+def keep_unstaged_output(output_dir):
+    output_dir = os.path.normpath(output_dir)
+    if not os.path.isdir(output_dir) or os.path.islink(output_dir):
+        return None
+    os.makedirs(builds_dir(output_dir), exist_ok=True)
+    kept_name = free_build_name(output_dir, time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(os.path.getmtime(output_dir))))
+    os.rename(output_dir, os.path.join(builds_dir(output_dir), kept_name))
+    return kept_name
+
+# Function to publish a finished staging folder: give it a free build name, switch the output folder over to it and
+# prune the earlier builds down to `keep`. The build that was live until now is always among the kept ones, even
+# after a --rollback made it older than others; the rest are pruned oldest first.
+# Returns the name of the new build and of the builds kept.
+def publish_build(output_dir, staging_dir, keep):
+    previous_live = keep_unstaged_output(output_dir) or live_build(output_dir)
+    build_name = free_build_name(output_dir, os.path.basename(staging_dir)[:-len(STAGING_SUFFIX)])
+    os.rename(staging_dir, os.path.join(builds_dir(output_dir), build_name))
+    switch_live_build(output_dir, build_name)
+    
+    builds = list_builds(output_dir)
+    kept = [previous_live] if keep > 0 and previous_live in builds else []
+    others = [name for name in builds if name != build_name and name not in kept]
+    if keep > len(kept):
+        kept += others[-(keep - len(kept)):]
+    for name in others:
+        if name not in kept:
+            shutil.rmtree(os.path.join(builds_dir(output_dir), name))
+    return build_name, sorted(kept)
+
+# Function to switch a staged output folder back to the build before the live one; returns its name, or None
+def rollback_build(output_dir):
+    live = live_build(output_dir)
+    earlier = [name for name in list_builds(output_dir) if live is None or name < live]
+    if not earlier:
+        return None
+    keep_unstaged_output(output_dir)
+    switch_live_build(output_dir, earlier[-1])
+    return earlier[-1]
+
+# Function to get the time of this build, which SOURCE_DATE_EPOCH overrides for reproducible builds
+def get_build_epoch():
+    return int(os.environ.get('SOURCE_DATE_EPOCH', time.time()))
+
+# Function to render the whole site into page_store or output_archive, for build_site() and build_archive().
+# Returns the content hash of every file and the build phases it ran. The module state is put back as it was
+# afterwards, so a long-running caller does not keep the dataset or the phases of every build alive.
+def render_site(dataset, config):
+    saved_data = get_build_data()
+    phase_count = len(build_phases)
+    try:
+        if isinstance(dataset, (str, os.PathLike)):
+            dataset = read_restaurants(dataset)
+        data = group_restaurants(list(dataset))
+        data['similar_seed'] = config.get('seed', SIMILAR_RESTAURANTS_SEED)
+        data['url_mode'] = config.get('url_mode', URL_MODE)
+        data['minify'] = config.get('minify', False)
+        data['page_size'] = max(1, config.get('page_size', LISTING_PAGE_SIZE))
+        set_build_data(data)
+        
+        output_hashes.clear()
+        write_static_files()
+        write_search_index(all_restaurants)
+        generate_homepage()
+        generate_pages(data)
+        generate_sitemap()
+        if config.get('site_url'):
+            today = config.get('date') or datetime.datetime.fromtimestamp(get_build_epoch(), datetime.timezone.utc).date().isoformat()
+            lastmod = {page_path: [content_hash, today] for page_path, content_hash in output_hashes.items() if page_path.endswith('.html')}
+            generate_xml_sitemaps(lastmod, config['site_url'])
+        return dict(output_hashes), build_phases[phase_count:]
+    finally:
+        set_build_data(saved_data)
+        output_hashes.clear()
+        del build_phases[phase_count:]
+
+# Function to render the whole site in memory, returning the content of every file by its path in the output folder.
+# dataset is an Outscraper CSV file or a list of Restaurant records; config takes the command line options
+# url_mode, minify, page_size, seed and site_url, which adds sitemap.xml with every page dated config['date'] or today.
+# Nothing is read from or written to OUTPUT_DIR, and every page is rendered in this process.
+def build_site(dataset, config=None):
+    global page_store
+    page_store = {}
+    try:
+        render_site(dataset, config or {})
+        return dict(sorted(page_store.items()))
+    finally:
+        page_store = None
+
+# Function to render the whole site straight into a .zip, .tar, .tar.gz or .tar.zst archive, without writing the
+# output folder. The archive ends with a SHA256SUMS manifest of every file, so an extracted copy can be checked
+# with `sha256sum -c SHA256SUMS`. It is written under a temp name and renamed into place once complete.
+# Takes the same dataset and config as build_site(); returns the number of files, the archive size and the
+# build phases it ran.
+def build_archive(dataset, config, archive_path):
+    global output_archive
+    kind = archive_kind(archive_path)
+    temp_path = archive_path + '.tmp'
+    archive, streams = open_archive(temp_path, kind, 'w')
+    output_archive = {'archive': archive, 'kind': kind, 'mtime': get_build_epoch()}
+    try:
+        content_hashes, phases = render_site(dataset, config or {})
+        manifest = ''.join(f'{content_hash}  {page_path}\n' for page_path, content_hash in sorted(content_hashes.items()))
+        add_to_archive(ARCHIVE_MANIFEST, manifest.encode('utf-8'))
+    except BaseException:
+        close_archive(archive, streams)
+        os.remove(temp_path)
+        raise
+    finally:
+        output_archive = None
+    close_archive(archive, streams)
+    os.replace(temp_path, archive_path)
+    return len(content_hashes), os.path.getsize(archive_path), phases
+
+# Function to check an archive against its SHA256SUMS manifest; returns a list of problems, empty if it is intact
+def verify_archive(archive_path):
+    archive, streams = open_archive(archive_path, archive_kind(archive_path), 'r')
+    hashes = {}
+    manifest = None
+    try:
+        if not streams:
+            members = ((name, archive.read(name)) for name in archive.namelist() if not name.endswith('/'))
+        else:
+            members = ((member.name, archive.extractfile(member).read()) for member in archive if member.isfile())
+        for name, data in members:
+            if name == ARCHIVE_MANIFEST:
+                manifest = data.decode('utf-8')
+            else:
+                hashes[name] = hashlib.sha256(data).hexdigest()
+    finally:
+        close_archive(archive, streams)
+    
+    if manifest is None:
+        return [f'{ARCHIVE_MANIFEST} is missing']
+    expected = dict(reversed(line.split('  ', 1)) for line in manifest.splitlines() if line)
+    problems = [f'{name}: missing' for name in sorted(expected.keys() - hashes.keys())]
+    problems += [f'{name}: not in {ARCHIVE_MANIFEST}' for name in sorted(hashes.keys() - expected.keys())]
+    problems += [f'{name}: hash mismatch' for name in sorted(expected.keys() & hashes.keys()) if expected[name] != hashes[name]]
+    return problems
+
+# Timings of the build phases in the order they ran, each a dict with its name, seconds, pages and bytes written
+build_phases = []
+# Whether build phases record their memory use, set by --memory once tracemalloc is tracing
+trace_memory = False
+
+# Function to get the lines that allocated the most memory still held since an earlier tracemalloc snapshot
+def top_allocation_sites(before, after):
+    import tracemalloc
+    
+    # Leave out tracemalloc's own bookkeeping and the frozen import machinery
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen *>')]
+    differences = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    sites = []
+    for difference in differences[:MEMORY_TOP_SITES]:
+        if difference.size_diff <= 0:
+            break
+        frame = difference.traceback[0]
+        sites.append((f'{os.path.basename(frame.filename)}:{frame.lineno}', difference.size_diff))
+    return sites
+
+# Context manager to time a build phase; the phase's dict can be given the pages and bytes it wrote.
+# With trace_memory set, the phase also records its peak memory and top allocation sites.
+@contextlib.contextmanager
+def build_phase(name):
+    phase = {'name': name, 'seconds': 0.0, 'pages': 0, 'bytes': 0}
+    tracing = trace_memory
+    if tracing:
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield phase
+    finally:
+        phase['seconds'] = time.perf_counter() - start
+        if tracing:
+            phase['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            phase['allocations'] = top_allocation_sites(snapshot, tracemalloc.take_snapshot())
+        build_phases.append(phase)
+
+# Function to print the time, pages/sec and bytes written of every build phase
+def print_build_report(phases):
+    print("Build phases:")
+    for phase in phases:
+        line = f"  {phase['name']:<18} {phase['seconds']:8.3f}s"
+        if phase['pages']:
+            line += f"  {phase['pages']:>7} pages {phase['pages'] / max(phase['seconds'], 1e-9):>9.0f} pages/s"
+        if phase['bytes']:
+            line += f"  {phase['bytes']:>13,} bytes"
+        if 'peak_memory' in phase:
+            line += f"  peak {phase['peak_memory'] / (1024 * 1024):.1f} MB"
+        print(line)
+        for site, size in phase.get('allocations', []):
+            print(f"    {size / 1024:>10,.1f} KB held from {site}")
+    print(f"  {'total':<18} {sum(phase['seconds'] for phase in phases):8.3f}s")
+    if any('peak_memory' in phase for phase in phases):
+        print(f"  {'peak memory':<18} {max(phase.get('peak_memory', 0) for phase in phases) / (1024 * 1024):.1f} MB")
+
+# Function to turn cProfile stats into collapsed stacks ("outer;inner;leaf microseconds" lines) for flamegraph tools.
+# cProfile only keeps caller -> callee totals, so the time of a function called from several places is split
+# between them in proportion to each caller's share.
+def collapsed_stacks(stats):
+    callees = defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge[3]))
+    
+    def label(function):
+        file_name, line, name = function
+        return f'{name} ({os.path.basename(file_name)}:{line})' if line else name
+    
+    stacks = defaultdict(float)
+    
+    def walk(function, path, share):
+        _, _, self_time, _, _ = stats[function]
+        path = path + [label(function)]
+        stacks[';'.join(path)] += self_time * share
+        for callee, edge_time in callees[function]:
+            callee_time = stats[callee][3]
+            # Skip recursion and branches too small to show up in a flamegraph
+            if label(callee) in path or callee_time <= 0 or edge_time * share < 1e-6:
+                continue
+            walk(callee, path, share * edge_time / callee_time)
+    
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(function, [], 1.0)
+    return [f'{stack} {round(seconds * 1e6)}' for stack, seconds in sorted(stacks.items()) if round(seconds * 1e6) > 0]
+
+# Function to save cProfile stats and a collapsed-stack file of a profiled build
+def save_profile(profiler):
+    import pstats
+    
+    profiler.dump_stats(PROFILE_FILE)
+    stats = pstats.Stats(profiler)
+    with open(COLLAPSED_STACKS_FILE, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(collapsed_stacks(stats.stats)) + '\n')
+    stats.sort_stats('cumulative').print_stats(15)
+    print(f"Profile saved to '{PROFILE_FILE}' and collapsed stacks to '{COLLAPSED_STACKS_FILE}' "
+          f"(e.g. flamegraph.pl {COLLAPSED_STACKS_FILE} > build.svg).")
+
+def main():
+    global trace_memory
+    
+    # The command line tools are only imported here, so importing this module for build_site() stays cheap
+    import argparse
+    import cProfile
+    import tracemalloc
+    
+    parser = argparse.ArgumentParser(description=f'Generate the {SITE_NAME} static site.')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='number of worker processes for rendering pages (0 uses one per CPU)')
+    parser.add_argument('--seed', type=int, default=SIMILAR_RESTAURANTS_SEED,
+                        help='seed for picking similar restaurants (default: %(default)s)')
+    parser.add_argument('--url-mode', choices=['relative', 'absolute-clean'], default=URL_MODE,
+                        help="how pages link to each other (default: %(default)s; use absolute-clean for Vercel)")
+    parser.add_argument('--page-size', type=int, default=LISTING_PAGE_SIZE,
+                        help='restaurants per area and category listing page (default: %(default)s)')
+    parser.add_argument('--minify', action='store_true',
+                        help='strip comments and indentation from the HTML pages and report the bytes saved')
+    parser.add_argument('--compress', action='store_true',
+                        help=f'write .gz (and .br with brotli installed) siblings of each page and an nginx {NGINX_CONFIG_FILE} next to the output folder')
+    parser.add_argument('--site-url', default=SITE_URL,
+                        help='public address of the site, e.g. https://example.com; writes sitemap.xml when set')
+    parser.add_argument('--full', action='store_true',
+                        help='wipe the output directory and re-render every page instead of only changed ones')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'profile the build in one process, saving {PROFILE_FILE} and {COLLAPSED_STACKS_FILE}')
+    parser.add_argument('--memory', action='store_true',
+                        help='trace memory in one process and report the peak and top allocation sites of each phase')
+    parser.add_argument('--write-threads', type=int, default=WRITE_THREADS,
+                        help='threads writing pages in the background, 0 to write them as they are rendered (default: %(default)s)')
+    parser.add_argument('--write-queue', type=int, default=WRITE_QUEUE_SIZE,
+                        help='rendered pages that may wait for a writer thread before rendering pauses (default: %(default)s)')
+    parser.add_argument('--atomic-writes', action='store_true',
+                        help='write every file to a temp file and rename it into place')
+    parser.add_argument('--archive', metavar='PATH',
+                        help=f'render the site straight into a .zip, .tar, .tar.gz or .tar.zst archive with a {ARCHIVE_MANIFEST} '
+                             'manifest instead of the output folder (pages are rendered in one process)')
+    parser.add_argument('--verify-archive', metavar='PATH',
+                        help=f'check an archive written by --archive against its {ARCHIVE_MANIFEST} manifest and exit')
+    parser.add_argument('--staged', action='store_true',
+                        help=f'build into {OUTPUT_DIR}{BUILDS_DIR_SUFFIX}/<build time> and publish it by swapping the {OUTPUT_DIR} symlink')
+    parser.add_argument('--keep-builds', type=int, default=STAGED_BUILDS_KEPT,
+                        help='earlier builds --staged keeps for --rollback (default: %(default)s)')
+    parser.add_argument('--rollback', action='store_true',
+                        help=f'switch {OUTPUT_DIR} back to the build before the live one and exit')
+    args = parser.parse_args()
+    
+    if args.rollback:
+        build_name = rollback_build(OUTPUT_DIR)
+        if build_name is None:
+            raise SystemExit(f"No earlier build in '{builds_dir(OUTPUT_DIR)}' to roll back to.")
+        print(f"'{OUTPUT_DIR}' now serves build {build_name}.")
+        return
+    if args.verify_archive:
+        problems = verify_archive(args.verify_archive)
+        for problem in problems:
+            print(problem)
+        print(f"'{args.verify_archive}' is {'damaged' if problems else 'intact'}.")
+        raise SystemExit(1 if problems else 0)
+    if args.archive:
+        if args.staged:
+            parser.error('--staged publishes the output folder and cannot be combined with --archive')
+        if args.compress:
+            parser.error('--compress precompresses the output folder and cannot be combined with --archive')
+        try:
+            kind = archive_kind(args.archive)
+        except ValueError as error:
+            parser.error(str(error))
+        if kind == 'tar.zst' and not zstd_available():
+            parser.error(ZSTD_MISSING)
+    
+    # Worker processes are neither traced nor profiled, so these modes render every page in this process
+    if args.memory or args.profile:
+        args.jobs = 1
+    if args.memory:
+        tracemalloc.start()
+        trace_memory = True
+    
+    if not args.profile:
+        run_build(args)
+        return
+    
+    profiler = cProfile.Profile()
+    profiler.runcall(run_build, args)
+    save_profile(profiler)
+
+# Function to run the whole build for the parsed command line options and print the build report
+def run_build(args):
+    global OUTPUT_DIR
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    
+    # An archive build renders everything in this process and leaves the output folder alone
+    if args.archive:
+        config = {'url_mode': args.url_mode, 'minify': args.minify, 'page_size': args.page_size,
+                  'seed': args.seed, 'site_url': args.site_url}
+        start = time.perf_counter()
+        file_count, archive_size, phases = build_archive(CSV_FILE, config, args.archive)
+        print(f"Wrote {file_count} files to '{args.archive}' ({archive_size:,} bytes) with a {ARCHIVE_MANIFEST} manifest "
+              f"in {time.perf_counter() - start:.3f}s.")
+        print_build_report(phases)
+        return
+    
+    # A staged build renders into a staging folder and only touches the live site when publishing it
+    # The lastmod dates come from the live site, even when a full staged build starts from an empty folder
+    site_dir = OUTPUT_DIR
+    previous_lastmod = (load_manifest() or {}).get('lastmod', {})
+    if args.staged:
+        with build_phase('staging setup'):
+            OUTPUT_DIR = staging_dir = create_staging_dir(site_dir, fresh=args.full)
+    
+    # Reuse the previous build unless asked for a full rebuild or there is no manifest to go by
+    template_version = get_template_version(args.url_mode, args.minify)
+    manifest = None if args.full else load_manifest()
+    with build_phase('directory setup'):
+        create_output_dirs(clean=manifest is None)
+    with build_phase('csv load'):
+        restaurants = list(read_restaurants(CSV_FILE))
+    with build_phase('sort and index'):
+        data = group_restaurants(restaurants)
+    data['similar_seed'] = args.seed
+    data['url_mode'] = args.url_mode
+    data['minify'] = args.minify
+    data['page_size'] = max(1, args.page_size)
+    data['atomic_writes'] = args.atomic_writes or args.staged
+    data['output_dir'] = OUTPUT_DIR
+    if manifest and manifest.get('template_version') == template_version:
+        data['previous_pages'] = manifest['pages']
+    set_build_data(data)
+    
+    with build_phase('css and logo'):
+        write_static_files()
+    with build_phase('search index') as phase:
+        search_index_bytes = phase['bytes'] = write_search_index(all_restaurants)
+    with build_phase('homepage') as phase:
+        generate_homepage()
+        phase['pages'], phase['bytes'] = 1, os.path.getsize(os.path.join(OUTPUT_DIR, 'index.html'))
+    # Worker processes write their pages themselves, so the writer threads serve this process only
+    if args.write_threads > 0 and jobs <= 1:
+        start_page_writer(args.write_threads, args.write_queue)
+    try:
+        entries = generate_pages(data, jobs)
+    finally:
+        with build_phase('page writes'):
+            writer = finish_page_writer()
+    with build_phase('sitemap') as phase:
+        generate_sitemap()
+        phase['pages'], phase['bytes'] = 1, os.path.getsize(os.path.join(OUTPUT_DIR, 'sitemap.html'))
+    
+    pages = {page_path: inputs_hash for page_path, inputs_hash, _ in entries}
+    removed = remove_orphaned_pages(manifest['pages'] if manifest else {}, pages)
+    
+    # Pages that were not rendered again kept their content, so their previous content hash still holds
+    content_hashes = {'index.html': file_content_hash('index.html'), 'sitemap.html': file_content_hash('sitemap.html')}
+    for page_path, _, sizes in entries:
+        previous = previous_lastmod.get(page_path)
+        content_hashes[page_path] = sizes[2] if sizes else previous[0] if previous else file_content_hash(page_path)
+    today = datetime.datetime.fromtimestamp(get_build_epoch(), datetime.timezone.utc).date().isoformat()
+    lastmod = update_lastmod(content_hashes, previous_lastmod, today)
+    save_manifest(template_version, pages, lastmod, args.url_mode)
+    if args.site_url:
+        with build_phase('xml sitemap'):
+            url_count, sitemap_count = generate_xml_sitemaps(lastmod, args.site_url)
+    
+    written = [sizes for _, _, sizes in entries if sizes]
+    print(f"Rendered {len(written)} of {len(entries)} pages, removed {removed} orphaned pages.")
+    print(f"Search index: {search_index_bytes:,} bytes for {len(all_restaurants)} restaurants.")
+    if args.site_url:
+        print(f"sitemap.xml indexes {url_count} URLs in {sitemap_count} sitemap file(s).")
+    if args.minify and written:
+        rendered_bytes = sum(sizes[0] for sizes in written)
+        saved_bytes = rendered_bytes - sum(sizes[1] for sizes in written)
+        print(f"Minifying saved {saved_bytes:,} of {rendered_bytes:,} bytes ({saved_bytes / rendered_bytes:.1%}) on the rendered pages.")
+    if writer and writer['files']:
+        print(f"Writer threads wrote {writer['files']} pages, {writer['bytes']:,} bytes at "
+              f"{writer['bytes'] / max(writer['seconds'], 1e-9) / (1024 * 1024):.1f} MB/s per thread ({writer['threads']} threads); "
+              f"rendering waited {writer['waited']:.3f}s for queue space.")
+    
+    if args.compress:
+        with build_phase('compress'):
+            results = compress_output(jobs, site_dir)
+        compressed = sum(1 for written, _ in results if written)
+        original_bytes = sum(sizes[0] for _, sizes in results)
+        gzip_bytes = sum(sizes[1] for _, sizes in results)
+        print(f"Compressed {compressed} of {len(results)} files: {original_bytes:,} bytes, {gzip_bytes:,} gzipped", end='')
+        if brotli is not None:
+            print(f", {sum(sizes[2] for _, sizes in results):,} with brotli", end='')
+        print('.')
+    
+    if args.staged:
+        with build_phase('publish'):
+            build_name, kept = publish_build(site_dir, staging_dir, args.keep_builds)
+        OUTPUT_DIR = site_dir
+        print(f"Published build {build_name}; {len(kept)} earlier build(s) kept in '{builds_dir(site_dir)}' for --rollback.")
+    print_build_report(build_phases)
+    print(f"Restaurant directory generated in '{OUTPUT_DIR}' folder.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import csv
+import random
+import string
+
+from generate_restaurant_directory import CSV_FILE, CSV_COLUMNS
+
+# Share of synthetic restaurants that reuse a real name, like chains with many branches
+CHAIN_SHARE = 0.1
+# Spread of the synthetic coordinates around the sample restaurant they are based on (about 300 m)
+COORDINATE_JITTER_DEGREES = 0.003
+PLACE_ID_CHARACTERS = string.ascii_letters + string.digits + '-_'
+
+# Function to read the sample Outscraper export the synthetic rows are modelled on
+def load_sample_rows(csv_file):
+    with open(csv_file, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        return reader.fieldnames, [row for row in reader if row['name'].strip()]
+
+# Function to make up a place id in the format Google uses
+def make_place_id(rng):
+    return 'ChIJ' + ''.join(rng.choices(PLACE_ID_CHARACTERS, k=23))
+
+# Function to generate one synthetic row: a random sample restaurant with a new name, place id,
+# street number and position, and rating and reviews drawn from other sample restaurants
+def synthesize_row(sample_rows, name_words, columns, rng):
+    template = rng.choice(sample_rows)
+    row = {column: template.get(column, '') for column in columns}
+
+    if rng.random() < CHAIN_SHARE:
+        name = template['name']
+    else:
+        name = ' '.join(rng.sample(name_words, rng.choice((1, 2, 2, 3))))
+
+    street = template['street']
+    if street:
+        street = f"{street.rstrip('0123456789 ').strip()} {rng.randint(1, 200)}"
+    full_address = ', '.join(part for part in (street, f"{template['postal_code']} {template['city']}".strip()) if part)
+
+    latitude, longitude = template['latitude'], template['longitude']
+    if latitude and longitude:
+        latitude = f"{float(latitude) + rng.gauss(0, COORDINATE_JITTER_DEGREES):.7f}"
+        longitude = f"{float(longitude) + rng.gauss(0, COORDINATE_JITTER_DEGREES):.7f}"
+
+    row.update(
+        name=name,
+        street=street,
+        full_address=full_address,
+        place_id=make_place_id(rng),
+        rating=rng.choice(sample_rows)['rating'],
+        reviews=rng.choice(sample_rows)['reviews'],
+        latitude=latitude,
+        longitude=longitude
+    )
+    return row
+
+# Function to write a synthetic export with the given number of rows; the same seed gives the same file
+def generate_synthetic_csv(output_file, rows, seed=0, all_columns=False, sample_file=CSV_FILE):
+    header, sample_rows = load_sample_rows(sample_file)
+    columns = header if all_columns else [column for column in header if column in CSV_COLUMNS]
+    name_words = sorted({word for row in sample_rows for word in row['name'].split() if len(word) > 2})
+    rng = random.Random(seed)
+
+    with open(output_file, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        for _ in range(rows):
+            writer.writerow(synthesize_row(sample_rows, name_words, columns, rng))
+    return output_file
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate a synthetic Outscraper restaurant export for benchmarks.')
+    parser.add_argument('rows', type=int, help='number of restaurants to generate')
+    parser.add_argument('--output', help='CSV file to write (default: synthetic_<rows>.csv)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: %(default)s)')
+    parser.add_argument('--all-columns', action='store_true',
+                        help='write every column of the sample export, not just the ones the generator reads')
+    parser.add_argument('--sample', default=CSV_FILE, help='export to model the data on (default: %(default)s)')
+    args = parser.parse_args()
+
+    output_file = args.output or f'synthetic_{args.rows}.csv'
+    generate_synthetic_csv(output_file, args.rows, args.seed, args.all_columns, args.sample)
+    print(f"Wrote {args.rows} synthetic restaurants to '{output_file}'")
@@ -1,76 +1,41 @@
+import json
 import os
-import re
-import shutil
-from pathlib import Path
+import sys
 
-# Source and destination directories
+from generate_restaurant_directory import MANIFEST_FILE
+from sync_output import sync_tree
+
+# Source and destination directories; the source should be generated with
+# `python generate_restaurant_directory.py --url-mode absolute-clean` so its links are already clean URLs
 source_dir = 'zurich_restaurants'
 build_dir = 'build'
 
 # Create build directory if it doesn't exist
 os.makedirs(build_dir, exist_ok=True)
 
-# Function to fix paths in HTML files
-def fix_paths_in_file(file_path, dest_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-    
-    # Fix relative paths in the file
-    # For CSS files
-    content = re.sub(r'href="\.\.\/style\.css"', 'href="/style.css"', content)
-    content = re.sub(r'href="style\.css"', 'href="/style.css"', content)
-    
-    # For images
-    content = re.sub(r'src="\.\.\/Restaurants\.png"', 'src="/Restaurants.png"', content)
-    content = re.sub(r'src="Restaurants\.png"', 'src="/Restaurants.png"', content)
-    content = re.sub(r'href="\.\.\/Favicon\.png"', 'href="/Favicon.png"', content)
-    content = re.sub(r'href="Favicon\.png"', 'href="/Favicon.png"', content)
-    
-    # For links to other pages
-    content = re.sub(r'href="\.\.\/index\.html"', 'href="/"', content)
-    content = re.sub(r'href="index\.html"', 'href="/"', content)
-    
-    # Fix area and category links
-    content = re.sub(r'href="\.\.\/([^\/]+)\/index\.html"', r'href="/\1/"', content)
-    content = re.sub(r'href="([^\/\.]+)\/index\.html"', r'href="/\1/"', content)
-    
-    # Fix restaurant links
-    content = re.sub(r'href="\.\.\/restaurant\/([^"]+)\.html"', r'href="/restaurant/\1"', content)
-    content = re.sub(r'href="restaurant\/([^"]+)\.html"', r'href="/restaurant/\1"', content)
-    
-    with open(dest_path, 'w', encoding='utf-8') as file:
-        file.write(content)
-    
-    return True
+# Function to read the URL mode the source was generated with from its build manifest
+def source_url_mode():
+    try:
+        with open(os.path.join(source_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest.get('url_mode') if isinstance(manifest, dict) else None
 
-# Copy and process all files
+# Mirror the generated site into the build directory, skipping unchanged files and deleting stale ones
 def process_all_files():
-    html_count = 0
-    file_count = 0
+    # Relative links break under Vercel's clean URLs, so a site built for reading from disk is not deployed
+    url_mode = source_url_mode()
+    if url_mode != 'absolute-clean':
+        print(f"Error: '{source_dir}' was generated with URL mode {url_mode or 'unknown'}, not absolute-clean.", file=sys.stderr)
+        print("Run `python generate_restaurant_directory.py --url-mode absolute-clean` first.", file=sys.stderr)
+        sys.exit(1)
     
-    for root, dirs, files in os.walk(source_dir):
-        # Create corresponding directory in build
-        rel_path = os.path.relpath(root, source_dir)
-        build_path = os.path.join(build_dir, rel_path) if rel_path != '.' else build_dir
-        os.makedirs(build_path, exist_ok=True)
-        
-        for file in files:
-            source_file = os.path.join(root, file)
-            dest_file = os.path.join(build_path, file)
-            
-            if file.endswith('.html'):
-                # Process HTML files
-                if fix_paths_in_file(source_file, dest_file):
-                    html_count += 1
-                    print(f"Processed HTML: {source_file} -> {dest_file}")
-            else:
-                # Copy other files as is
-                shutil.copy2(source_file, dest_file)
-                file_count += 1
-                print(f"Copied file: {source_file} -> {dest_file}")
+    # The build manifest is only for incremental builds, so it is not deployed
+    stats = sync_tree(source_dir, build_dir, keep=['vercel.json'], exclude=[MANIFEST_FILE])
     
-    print(f"\nTotal HTML files processed: {html_count}")
-    print(f"Total other files copied: {file_count}")
+    print(f"Files reflinked: {stats['reflinked']}, hardlinked: {stats['hardlinked']}, copied: {stats['copied']}")
+    print(f"Files unchanged: {stats['unchanged']}, stale files removed: {stats['removed']}")
     print(f"All files prepared for Vercel in the '{build_dir}' directory")
 
 if __name__ == "__main__":
@@ -79,7 +44,15 @@ if __name__ == "__main__":
     # Create a vercel.json file in the build directory
     vercel_config = '''{
   "trailingSlash": true,
-  "cleanUrls": true
+  "cleanUrls": true,
+  "headers": [
+    {
+      "source": "/style.(.*).css",
+      "headers": [
+        { "key": "Cache-Control", "value": "public, max-age=31536000, immutable" }
+      ]
+    }
+  ]
 }'''
     
     with open(os.path.join(build_dir, 'vercel.json'), 'w') as f:
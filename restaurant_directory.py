@@ -1,8 +1,8 @@
-import csv
 import os
 import re
 from collections import defaultdict
 import math
+from generate_restaurant_directory import Restaurant, read_csv_rows, parse_number
 
 # Define constants
 CSV_FILE = 'Outscraper-20250307150536s9c_restaurants.csv'
@@ -91,83 +91,76 @@ def determine_category(restaurant_type, subtypes):
 def calculate_score(rating, reviews):
     if not rating or not reviews:
         return 0
-    try:
-        rating = float(rating)
-        reviews = float(reviews)
-        return rating * math.log(reviews + 1)
-    except:
-        return 0
+    return rating * math.log(reviews + 1)
 
 # Read and process the CSV file
 restaurants_by_area = defaultdict(list)
 restaurants_by_area_category = defaultdict(lambda: defaultdict(list))
 
-with open(CSV_FILE, 'r', encoding='utf-8') as file:
-    reader = csv.DictReader(file)
-    for row in reader:
-        name = clean_text(row.get('name', ''))
-        if not name:
-            continue
-            
-        address = clean_text(row.get('full_address', ''))
-        postal_code = clean_text(row.get('postal_code', ''))
-        restaurant_type = clean_text(row.get('type', ''))
-        subtypes = clean_text(row.get('subtypes', ''))
-        rating = row.get('rating', '0')
-        reviews = row.get('reviews', '0')
-        website = clean_text(row.get('site', ''))
-        phone = clean_text(row.get('phone', ''))
-        
-        # Determine area and category
-        area = determine_area(address, postal_code)
-        category = determine_category(restaurant_type, subtypes)
-        
-        # Calculate score for ranking
-        score = calculate_score(rating, reviews)
+for row in read_csv_rows(CSV_FILE):
+    name = clean_text(row['name'])
+    if not name:
+        continue
         
-        # Create restaurant object
-        restaurant = {
-            'name': name,
-            'address': address,
-            'postal_code': postal_code,
-            'type': restaurant_type,
-            'category': category,
-            'rating': rating,
-            'reviews': reviews,
-            'score': score,
-            'website': website,
-            'phone': phone
-        }
-        
-        # Add to appropriate collections
-        restaurants_by_area[area].append(restaurant)
-        restaurants_by_area_category[area][category].append(restaurant)
+    address = clean_text(row['full_address'])
+    postal_code = clean_text(row['postal_code'])
+    restaurant_type = clean_text(row['type'])
+    subtypes = clean_text(row['subtypes'])
+    rating = parse_number(row['rating'], 0.0)
+    reviews = int(parse_number(row['reviews'], 0))
+    
+    # Determine area and category
+    area = determine_area(address, postal_code)
+    category = determine_category(restaurant_type, subtypes)
+    
+    # Create restaurant object
+    restaurant = Restaurant(
+        name=name,
+        address=address,
+        postal_code=postal_code,
+        type=restaurant_type,
+        category=category,
+        area=area,
+        rating=rating,
+        reviews=reviews,
+        score=calculate_score(rating, reviews),
+        website=clean_text(row['site']),
+        phone=clean_text(row['phone']),
+        photo='',
+        price_range='',
+        latitude=None,
+        longitude=None
+    )
+    
+    # Add to appropriate collections
+    restaurants_by_area[area].append(restaurant)
+    restaurants_by_area_category[area][category].append(restaurant)
 
 # Sort restaurants by score in descending order
 for area in restaurants_by_area:
-    restaurants_by_area[area].sort(key=lambda x: float(x['score']), reverse=True)
+    restaurants_by_area[area].sort(key=lambda x: x.score, reverse=True)
     
     for category in restaurants_by_area_category[area]:
-        restaurants_by_area_category[area][category].sort(key=lambda x: float(x['score']), reverse=True)
+        restaurants_by_area_category[area][category].sort(key=lambda x: x.score, reverse=True)
 
 # Function to generate HTML for a restaurant listing
 def generate_restaurant_html(restaurant):
-    rating_stars = '★' * int(float(restaurant['rating'])) + '☆' * (5 - int(float(restaurant['rating'])))
+    rating_stars = '★' * int(restaurant.rating) + '☆' * (5 - int(restaurant.rating))
     
     return f"""
     <div class="restaurant-card">
-        <h3>{restaurant['name']}</h3>
+        <h3>{restaurant.name}</h3>
         <div class="restaurant-details">
             <div class="rating">
                 <span class="stars">{rating_stars}</span>
-                <span class="rating-value">{restaurant['rating']}</span>
-                <span class="reviews">({restaurant['reviews']} reviews)</span>
+                <span class="rating-value">{restaurant.rating}</span>
+                <span class="reviews">({restaurant.reviews} reviews)</span>
             </div>
-            <div class="type">{restaurant['type']}</div>
-            <div class="address">{restaurant['address']}</div>
+            <div class="type">{restaurant.type}</div>
+            <div class="address">{restaurant.address}</div>
             <div class="contact">
-                {f'<a href="{restaurant["website"]}" target="_blank">Website</a>' if restaurant["website"] else ''}
-                {f'<span class="phone">{restaurant["phone"]}</span>' if restaurant["phone"] else ''}
+                {f'<a href="{restaurant.website}" target="_blank">Website</a>' if restaurant.website else ''}
+                {f'<span class="phone">{restaurant.phone}</span>' if restaurant.phone else ''}
             </div>
         </div>
     </div>
@@ -0,0 +1,133 @@
+import argparse
+import hashlib
+import os
+import shutil
+
+# Linux ioctl that makes a file share another file's blocks copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Function to hash the content of a file
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Function to check whether two files have the same content, comparing sizes before hashing
+def same_content(first_path, second_path):
+    if os.path.getsize(first_path) != os.path.getsize(second_path):
+        return False
+    return file_hash(first_path) == file_hash(second_path)
+
+# Function to reflink a file, returning False where the platform or filesystem can't
+def reflink(source_file, dest_file):
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source_file, 'rb') as src, open(dest_file, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        if os.path.exists(dest_file):
+            os.remove(dest_file)
+        return False
+    shutil.copystat(source_file, dest_file)
+    return True
+
+# Function to put source_file at dest_file sharing its data: a reflink, else a hardlink if allowed, else a copy.
+# A hardlinked dest_file changes with source_file if that is written in place, so hardlinks are only for callers
+# whose source files are always replaced by rename. The new file replaces dest_file by rename, so files
+# hardlinked to the old dest_file are left alone.
+def link_file(source_file, dest_file, allow_copy=True, hardlink=False):
+    temp_file = dest_file + '.sync-tmp'
+    if os.path.lexists(temp_file):
+        os.remove(temp_file)
+    if reflink(source_file, temp_file):
+        method = 'reflinked'
+    else:
+        try:
+            if not hardlink:
+                raise OSError('hardlinks not allowed')
+            os.link(source_file, temp_file)
+            method = 'hardlinked'
+        except OSError:
+            if not allow_copy:
+                return None
+            shutil.copy2(source_file, temp_file)
+            method = 'copied'
+    os.replace(temp_file, dest_file)
+    return method
+
+# Function to make dest_dir mirror source_dir, skipping unchanged files and deleting stale ones.
+# Paths in keep (relative to dest_dir) are never deleted, e.g. a vercel.json written after the sync.
+# Paths in exclude (relative to source_dir) are not mirrored, and removed from dest_dir if they were.
+# With hardlink set, files may be hardlinked to the source (see link_file).
+def sync_tree(source_dir, dest_dir, keep=(), hardlink=False, exclude=()):
+    stats = {'unchanged': 0, 'reflinked': 0, 'hardlinked': 0, 'copied': 0, 'removed': 0}
+    synced = set()
+    exclude = {os.path.normpath(path) for path in exclude}
+
+    for root, dirs, files in os.walk(source_dir):
+        rel_path = os.path.relpath(root, source_dir)
+        dest_root = os.path.normpath(os.path.join(dest_dir, rel_path))
+        if os.path.isfile(dest_root):
+            os.remove(dest_root)
+        os.makedirs(dest_root, exist_ok=True)
+
+        for file in files:
+            source_file = os.path.join(root, file)
+            dest_file = os.path.join(dest_root, file)
+            file_path = os.path.normpath(os.path.join(rel_path, file))
+            if file_path in exclude:
+                continue
+            synced.add(file_path)
+            if os.path.isdir(dest_file):
+                shutil.rmtree(dest_file)
+
+            if os.path.isfile(dest_file):
+                source_stat = os.stat(source_file)
+                dest_stat = os.stat(dest_file)
+                if os.path.samestat(source_stat, dest_stat):
+                    if hardlink:
+                        stats['unchanged'] += 1
+                        continue
+                    # A hardlink from an earlier sync would change along with the source, so give it its own data
+                elif source_stat.st_size == dest_stat.st_size and (
+                        source_stat.st_mtime_ns == dest_stat.st_mtime_ns or same_content(source_file, dest_file)):
+                    # Copies keep the source's mtime, so a matching size and mtime is trusted without reading
+                    # either file; identical content with another mtime gets the source's so the next sync is too
+                    if source_stat.st_mtime_ns != dest_stat.st_mtime_ns:
+                        shutil.copystat(source_file, dest_file)
+                    stats['unchanged'] += 1
+                    continue
+            stats[link_file(source_file, dest_file, hardlink=hardlink)] += 1
+
+    # Delete files that are no longer in the source, then the folders they leave empty
+    keep = {os.path.normpath(path) for path in keep}
+    for root, dirs, files in os.walk(dest_dir, topdown=False):
+        rel_path = os.path.relpath(root, dest_dir)
+        for file in files:
+            file_path = os.path.normpath(os.path.join(rel_path, file))
+            if file_path not in synced and file_path not in keep:
+                os.remove(os.path.join(root, file))
+                stats['removed'] += 1
+        if root != dest_dir and not os.listdir(root):
+            os.rmdir(root)
+
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Mirror a generated site into one or more folders, skipping unchanged files.')
+    parser.add_argument('source_dir', help='folder to mirror')
+    parser.add_argument('dest_dirs', nargs='+', metavar='dest_dir', help='folder to mirror it into')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATH',
+                        help='file (relative to source_dir) to leave out, e.g. .build-manifest.json; can be repeated')
+    parser.add_argument('--hardlink', action='store_true',
+                        help='allow hardlinks where reflinks are not supported; only safe when nothing rewrites the source files in place')
+    args = parser.parse_args()
+
+    for dest_dir in args.dest_dirs:
+        stats = sync_tree(args.source_dir, dest_dir, hardlink=args.hardlink, exclude=args.exclude)
+        print(f"Synced '{args.source_dir}' to '{dest_dir}': " + ', '.join(f"{count} {name}" for name, count in stats.items()))